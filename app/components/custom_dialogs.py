@@ -1,22 +1,116 @@
 """Custom dialogs for the application."""
 
-import hashlib
-import random
+import logging
+import os.path
+import zlib
+from functools import lru_cache
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton, QListWidget, 
     QListWidgetItem, QLabel, QDialogButtonBox, QGridLayout, QWidget, QFrame,
-    QScrollArea, QSizePolicy, QGraphicsOpacityEffect
+    QScrollArea, QSizePolicy
 )
-from PySide6.QtCore import Qt, Signal, QSize, QRect, QPropertyAnimation, QEasingCurve, QTimer
-from PySide6.QtGui import QPalette, QColor, QPainter, QFont, QPen, QBrush, QLinearGradient
+from PySide6.QtCore import Qt, Signal, QSize, QRect, QRectF, QPointF, QLine, QPropertyAnimation, QEasingCurve, QTimer, Property, Slot
+from PySide6.QtGui import (
+    QPalette, QColor, QPainter, QFont, QPen, QBrush, QLinearGradient, QPixmap,
+    QFontMetrics, QStaticText, QTransform
+)
+from app.services.database_manager import NotesDatabase
 from app.utils.translation_manager import tr
 
+logger = logging.getLogger(__name__)
+
+# Pastel color palette similar to bubbles
+_PASTEL_COLORS = (
+    QColor(135, 206, 235),   # Sky Blue
+    QColor(144, 238, 144),   # Light Green  
+    QColor(186, 85, 211),    # Medium Orchid
+    QColor(255, 105, 180),   # Hot Pink
+    QColor(255, 165, 79),    # Light Salmon
+    QColor(135, 206, 250),   # Light Sky Blue
+    QColor(255, 160, 122),   # Light Salmon
+    QColor(238, 130, 238),   # Violet
+    QColor(255, 182, 193),   # Light Pink
+    QColor(173, 216, 230),   # Light Blue
+)
+
+# Card background colors and their darker gradient stops
+_BASE_NORMAL = QColor(40, 40, 50, 180)
+_BASE_HOVER = QColor(50, 50, 60, 200)
+_BASE_SELECTED = QColor(70, 70, 80, 220)
+_BASE_NORMAL_DARK = QColor(30, 30, 40, 180)
+_BASE_HOVER_DARK = QColor(40, 40, 50, 200)
+_BASE_SELECTED_DARK = QColor(60, 60, 70, 220)
+
+# (is_selected, is_hovered) -> (base, darker)
+_BASE_COLORS = {
+    (False, False): (_BASE_NORMAL, _BASE_NORMAL_DARK),
+    (False, True): (_BASE_HOVER, _BASE_HOVER_DARK),
+    (True, False): (_BASE_SELECTED, _BASE_SELECTED_DARK),
+    (True, True): (_BASE_SELECTED, _BASE_SELECTED_DARK),
+}
+
+# Pens and brushes shared by every card
+_PEN_ICON_OUTLINE = QPen(QColor(255, 255, 255, 100), 1)
+_PEN_LETTER = QPen(QColor(255, 255, 255, 240), 1)
+_PEN_NAME = QPen(QColor(255, 255, 255, 220), 1)
+_PEN_PATH = QPen(QColor(255, 255, 255, 120), 1)
+_PEN_DELETE_OUTLINE = QPen(QColor(255, 255, 255, 200), 1)
+_PEN_DELETE_X = QPen(QColor(255, 255, 255, 240), 2)
+_BRUSH_DELETE = QBrush(QColor(255, 255, 255, 80))
+_BRUSH_DELETE_HOVER = QBrush(QColor(255, 0, 0, 150))
+
+# Notification overlay stylesheets, formatted once per message type
+_OVERLAY_QSS = "background-color: rgba(0, 0, 0, 0.5);"
+_NOTIFY_QSS_TEMPLATE = """
+    QWidget {{
+        background-color: {color};
+        border-radius: 8px;
+    }}
+    QLabel {{
+        color: white;
+        background: transparent;
+        border: none;
+        font-size: 14px;
+        font-weight: 500;
+    }}
+    QPushButton {{
+        background-color: rgba(255, 255, 255, 0.2);
+        border: 1px solid rgba(255, 255, 255, 0.3);
+        border-radius: 4px;
+        color: white;
+        font-size: 12px;
+        padding: 6px 12px;
+    }}
+    QPushButton:hover {{
+        background-color: rgba(255, 255, 255, 0.3);
+    }}
+"""
+_NOTIFY_QSS = {
+    "success": _NOTIFY_QSS_TEMPLATE.format(color="rgba(40, 167, 69, 0.9)"),
+    "error": _NOTIFY_QSS_TEMPLATE.format(color="rgba(220, 53, 69, 0.9)"),
+}
+
+
+@lru_cache(maxsize=256)
+def _pastel_color_for(text):
+    """Pick a stable palette color for text (crc32 is deterministic across runs)."""
+    return _PASTEL_COLORS[zlib.crc32(text.encode('utf-8')) % len(_PASTEL_COLORS)]
+
+
 class ProjectCard(QFrame):
     """Modern square card for project display with bubble-like styling."""
     
     clicked = Signal(int)  # Emits project_id when clicked
     delete_requested = Signal(int)  # Emits project_id when delete is requested
     
+    # Fonts are shared by every card rather than rebuilt on each render
+    _FONT_ICON = QFont("SF Pro Text", 18, QFont.Weight.Bold)
+    _FONT_NAME = QFont("SF Pro Text", 11, QFont.Weight.Medium)
+    _FONT_PATH = QFont("SF Pro Text", 8)
+    # QFontMetrics needs a QGuiApplication, so these are filled in lazily
+    _FM_NAME = None
+    _FM_PATH = None
+    
     def __init__(self, project_id, name, filepath, parent=None):
         super().__init__(parent)
         self.project_id = project_id
@@ -25,11 +119,26 @@ class ProjectCard(QFrame):
         self.is_hovered = False
         self.is_selected = False
         self.delete_hovered = False
+        self._cache = {}  # (is_selected, is_hovered) -> QPixmap
+        self._opacity = 1.0
         
         # Generate consistent color based on project name
         self.border_color = self._generate_pastel_color(name)
+        self._border_dark = QColor(
+            max(0, self.border_color.red() - 20),
+            max(0, self.border_color.green() - 20),
+            max(0, self.border_color.blue() - 20)
+        )
+        self._border_pen = QPen(self.border_color, 2)
         self.icon_letter = name[0].upper() if name else "P"
         
+        self._filename = os.path.basename(filepath) if filepath else ""
+        
+        # Static texts keep their layout between renders; they are elided and
+        # laid out against the card geometry in _update_geometry
+        self._name_static = self._make_static_text()
+        self._path_static = self._make_static_text()
+        
         # Set fixed size for square cards
         self.setFixedSize(140, 140)
         self.setFrameStyle(QFrame.Shape.NoFrame)
@@ -37,153 +146,179 @@ class ProjectCard(QFrame):
         
         # Enable mouse tracking for hover effects
         self.setMouseTracking(True)
+        self._update_geometry()
     
     def _generate_pastel_color(self, text):
         """Generate a consistent pastel color based on text hash."""
-        # Create hash from text for consistency
-        hash_obj = hashlib.md5(text.encode())
-        hash_hex = hash_obj.hexdigest()
-        
-        # Use hash to seed random for consistent colors
-        random.seed(int(hash_hex[:8], 16))
-        
-        # Pastel color palette similar to bubbles
-        pastel_colors = [
-            QColor(135, 206, 235),   # Sky Blue
-            QColor(144, 238, 144),   # Light Green  
-            QColor(186, 85, 211),    # Medium Orchid
-            QColor(255, 105, 180),   # Hot Pink
-            QColor(255, 165, 79),    # Light Salmon
-            QColor(135, 206, 250),   # Light Sky Blue
-            QColor(255, 160, 122),   # Light Salmon
-            QColor(238, 130, 238),   # Violet
-            QColor(255, 182, 193),   # Light Pink
-            QColor(173, 216, 230),   # Light Blue
-        ]
-        
-        return pastel_colors[random.randint(0, len(pastel_colors) - 1)]
-    
-    def paintEvent(self, event):
-        """Custom paint event for bubble-like styling."""
-        painter = QPainter(self)
+        return _pastel_color_for(text)
+    
+    @classmethod
+    def _font_metrics(cls):
+        """Return the (name, path) font metrics, built once a GUI app exists."""
+        if cls._FM_NAME is None:
+            cls._FM_NAME = QFontMetrics(cls._FONT_NAME)
+            cls._FM_PATH = QFontMetrics(cls._FONT_PATH)
+        return cls._FM_NAME, cls._FM_PATH
+    
+    def _make_static_text(self):
+        """Create a plain-text QStaticText that caches its glyph layout."""
+        static_text = QStaticText()
+        static_text.setTextFormat(Qt.TextFormat.PlainText)
+        static_text.setPerformanceHint(QStaticText.PerformanceHint.AggressiveCaching)
+        return static_text
+    
+    def _render_state_pixmap(self, state):
+        """Render the static parts of the card for a (selected, hovered) state."""
+        ratio = self.devicePixelRatioF()
+        pixmap = QPixmap(self.size() * ratio)
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        
+        painter = QPainter(pixmap)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
         
-        rect = self.rect().adjusted(4, 4, -4, -4)  # Add margin
-        
-        # Base colors
-        base_color = QColor(40, 40, 50, 180) if not self.is_selected else QColor(60, 60, 70, 200)
-        
-        # Hover effect
-        if self.is_hovered:
-            base_color = QColor(50, 50, 60, 200)
-        
-        # Selection effect
-        if self.is_selected:
-            base_color = QColor(70, 70, 80, 220)
+        rect = self._inner_rect
+        icon_rect = self._icon_rect
         
         # Draw main card background with gradient
+        base_color, base_dark = _BASE_COLORS[state]
         gradient = QLinearGradient(rect.topLeft(), rect.bottomRight())
         gradient.setColorAt(0, base_color)
-        gradient.setColorAt(1, QColor(base_color.red() - 10, base_color.green() - 10, base_color.blue() - 10, base_color.alpha()))
+        gradient.setColorAt(1, base_dark)
         
         painter.setBrush(QBrush(gradient))
-        painter.setPen(QPen(self.border_color, 2))
+        painter.setPen(self._border_pen)
         painter.drawRoundedRect(rect, 12, 12)
         
-        # Draw delete button (X) in top-right corner
-        delete_size = 20
-        delete_rect = QRect(
-            rect.right() - delete_size - 5,
-            rect.top() + 5,
-            delete_size,
-            delete_size
-        )
-        
-        # Delete button background
-        delete_bg_color = QColor(255, 0, 0, 150) if self.delete_hovered else QColor(255, 255, 255, 80)
-        painter.setBrush(QBrush(delete_bg_color))
-        painter.setPen(QPen(QColor(255, 255, 255, 200), 1))
-        painter.drawEllipse(delete_rect)
-        
-        # Draw X symbol
-        painter.setPen(QPen(QColor(255, 255, 255, 240), 2))
-        x_margin = 5
-        painter.drawLine(
-            delete_rect.left() + x_margin, delete_rect.top() + x_margin,
-            delete_rect.right() - x_margin, delete_rect.bottom() - x_margin
-        )
-        painter.drawLine(
-            delete_rect.right() - x_margin, delete_rect.top() + x_margin,
-            delete_rect.left() + x_margin, delete_rect.bottom() - x_margin
-        )
-        
-        # Draw icon circle in upper area
-        icon_size = 40
-        icon_rect = QRect(
-            rect.center().x() - icon_size // 2,
-            rect.top() + 20,
-            icon_size,
-            icon_size
-        )
-        
         # Icon background
         icon_gradient = QLinearGradient(icon_rect.topLeft(), icon_rect.bottomRight())
         icon_gradient.setColorAt(0, self.border_color)
-        icon_gradient.setColorAt(1, QColor(self.border_color.red() - 20, self.border_color.green() - 20, self.border_color.blue() - 20))
+        icon_gradient.setColorAt(1, self._border_dark)
         
         painter.setBrush(QBrush(icon_gradient))
-        painter.setPen(QPen(QColor(255, 255, 255, 100), 1))
+        painter.setPen(_PEN_ICON_OUTLINE)
         painter.drawEllipse(icon_rect)
         
         # Draw letter icon
-        painter.setPen(QPen(QColor(255, 255, 255, 240), 1))
-        font = QFont("SF Pro Text", 18, QFont.Weight.Bold)
-        painter.setFont(font)
+        painter.setPen(_PEN_LETTER)
+        painter.setFont(self._FONT_ICON)
         painter.drawText(icon_rect, Qt.AlignmentFlag.AlignCenter, self.icon_letter)
         
         # Draw project name
-        text_rect = QRect(rect.left() + 8, icon_rect.bottom() + 10, rect.width() - 16, 30)
-        painter.setPen(QPen(QColor(255, 255, 255, 220), 1))
-        font = QFont("SF Pro Text", 11, QFont.Weight.Medium)
-        painter.setFont(font)
-        
-        # Truncate name if too long
-        display_name = self.name
-        if len(display_name) > 12:
-            display_name = display_name[:12] + "..."
-        
-        painter.drawText(text_rect, Qt.AlignmentFlag.AlignCenter | Qt.TextFlag.TextWordWrap, display_name)
+        painter.setPen(_PEN_NAME)
+        painter.setFont(self._FONT_NAME)
+        painter.drawStaticText(self._name_pos, self._name_static)
         
         # Draw subtle file path
         if self.filepath:
-            path_rect = QRect(rect.left() + 8, text_rect.bottom() + 5, rect.width() - 16, 20)
-            painter.setPen(QPen(QColor(255, 255, 255, 120), 1))
-            font = QFont("SF Pro Text", 8)
-            painter.setFont(font)
-            
-            # Show just filename
-            filename = self.filepath.split('/')[-1] if '/' in self.filepath else self.filepath
-            if len(filename) > 15:
-                filename = filename[:15] + "..."
-            
-            painter.drawText(path_rect, Qt.AlignmentFlag.AlignCenter, filename)
+            painter.setPen(_PEN_PATH)
+            painter.setFont(self._FONT_PATH)
+            painter.drawStaticText(self._path_pos, self._path_static)
+        
+        painter.end()
+        return pixmap
     
-    def get_delete_rect(self):
-        """Get the rectangle for the delete button."""
-        rect = self.rect().adjusted(4, 4, -4, -4)
+    def paintEvent(self, event):
+        """Blit the cached card pixmap and draw the delete button on top."""
+        key = (self.is_selected, self.is_hovered)
+        pixmap = self._cache.get(key)
+        if pixmap is None:
+            pixmap = self._cache[key] = self._render_state_pixmap(key)
+        
+        painter = QPainter(self)
+        painter.setOpacity(self._opacity)
+        # Only blit the dirty part: delete-hover changes repaint just the button
+        dirty = event.rect()
+        ratio = pixmap.devicePixelRatio()
+        source = QRectF(dirty.x() * ratio, dirty.y() * ratio, dirty.width() * ratio, dirty.height() * ratio)
+        painter.drawPixmap(QRectF(dirty), pixmap, source)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
+        
+        # Draw delete button (X) in top-right corner
+        painter.setBrush(_BRUSH_DELETE_HOVER if self.delete_hovered else _BRUSH_DELETE)
+        painter.setPen(_PEN_DELETE_OUTLINE)
+        painter.drawEllipse(self._delete_rect)
+        
+        # Draw X symbol, both strokes in one call under the same pen
+        painter.setPen(_PEN_DELETE_X)
+        painter.drawLines(self._delete_x_lines)
+    
+    def _get_opacity(self):
+        """Return the paint opacity of the card."""
+        return self._opacity
+    
+    def _set_opacity(self, value):
+        """Set the paint opacity of the card and schedule a repaint."""
+        self._opacity = value
+        self.update()
+    
+    # Animatable paint opacity; cheaper than a QGraphicsOpacityEffect
+    opacity = Property(float, _get_opacity, _set_opacity)
+    
+    def resizeEvent(self, event):
+        """Drop cached pixmaps and geometry when the card size changes."""
+        self._cache.clear()
+        self._update_geometry()
+        super().resizeEvent(event)
+    
+    def _update_geometry(self):
+        """Recompute the cached layout rectangles for the current size."""
+        rect = self.rect().adjusted(4, 4, -4, -4)  # Add margin
+        self._inner_rect = rect
+        
+        # Icon circle in upper area, name and file path stacked below it
+        icon_size = 40
+        self._icon_rect = QRect(
+            rect.center().x() - icon_size // 2,
+            rect.top() + 20,
+            icon_size,
+            icon_size
+        )
+        self._text_rect = QRect(rect.left() + 8, self._icon_rect.bottom() + 10, rect.width() - 16, 30)
+        self._path_rect = QRect(rect.left() + 8, self._text_rect.bottom() + 5, rect.width() - 16, 20)
+        
+        # Elide both labels to the pixel width available and center them
+        fm_name, fm_path = self._font_metrics()
+        self._display_name = fm_name.elidedText(self.name, Qt.TextElideMode.ElideRight, self._text_rect.width())
+        self._display_filename = fm_path.elidedText(self._filename, Qt.TextElideMode.ElideRight, self._path_rect.width())
+        self._name_pos = self._layout_static_text(self._name_static, self._display_name, self._FONT_NAME, self._text_rect)
+        self._path_pos = self._layout_static_text(self._path_static, self._display_filename, self._FONT_PATH, self._path_rect)
+        
         delete_size = 20
-        return QRect(
+        self._delete_rect = QRect(
             rect.right() - delete_size - 5,
             rect.top() + 5,
             delete_size,
             delete_size
         )
+        # Antialiased outline bleeds one pixel past the button rect
+        self._delete_dirty_rect = self._delete_rect.adjusted(-1, -1, 1, 1)
+        
+        x_margin = 5
+        inner = self._delete_rect.adjusted(x_margin, x_margin, -x_margin, -x_margin)
+        self._delete_x_lines = [
+            QLine(inner.topLeft(), inner.bottomRight()),
+            QLine(inner.topRight(), inner.bottomLeft()),
+        ]
+    
+    def _layout_static_text(self, static_text, text, font, rect):
+        """Set and prepare a static text, returning the position that centers it in rect."""
+        static_text.setText(text)
+        static_text.prepare(QTransform(), font)
+        size = static_text.size()
+        return QPointF(
+            rect.left() + (rect.width() - size.width()) / 2,
+            rect.top() + (rect.height() - size.height()) / 2
+        )
+    
+    def get_delete_rect(self):
+        """Get the rectangle for the delete button."""
+        return self._delete_rect
     
     def mousePressEvent(self, event):
         """Handle mouse press for selection."""
         if event.button() == Qt.MouseButton.LeftButton:
-            delete_rect = self.get_delete_rect()
-            if delete_rect.contains(event.pos()):
+            if self._delete_rect.contains(event.pos()):
                 # Delete button clicked
                 self.delete_requested.emit(self.project_id)
             else:
@@ -192,19 +327,12 @@ class ProjectCard(QFrame):
     
     def mouseMoveEvent(self, event):
         """Handle mouse move for hover effects."""
-        delete_rect = self.get_delete_rect()
         old_delete_hovered = self.delete_hovered
-        self.delete_hovered = delete_rect.contains(event.pos())
+        self.delete_hovered = self._delete_rect.contains(event.pos())
         
-        # Update cursor based on hover state
-        if self.delete_hovered:
-            self.setCursor(Qt.CursorShape.PointingHandCursor)
-        else:
-            self.setCursor(Qt.CursorShape.PointingHandCursor)
-        
-        # Repaint if delete hover state changed
+        # Repaint only the delete button if its hover state changed
         if old_delete_hovered != self.delete_hovered:
-            self.update()
+            self.update(self._delete_dirty_rect)
     
     def enterEvent(self, event):
         """Handle mouse enter."""
@@ -227,9 +355,12 @@ class NewProjectCard(QFrame):
     
     clicked = Signal()
     
+    _FONT_NEW = QFont("SF Pro Text", 10, QFont.Weight.Medium)
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.is_hovered = False
+        self._cache = {}  # is_hovered -> QPixmap
         
         # Set fixed size for square cards
         self.setFixedSize(140, 140)
@@ -239,15 +370,20 @@ class NewProjectCard(QFrame):
         # Enable mouse tracking for hover effects
         self.setMouseTracking(True)
     
-    def paintEvent(self, event):
-        """Custom paint event for new project card."""
-        painter = QPainter(self)
+    def _render_state_pixmap(self, is_hovered):
+        """Render the card for the given hover state."""
+        ratio = self.devicePixelRatioF()
+        pixmap = QPixmap(self.size() * ratio)
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        
+        painter = QPainter(pixmap)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
         
         rect = self.rect().adjusted(4, 4, -4, -4)  # Add margin
         
         # Dashed border style
-        base_color = QColor(80, 80, 90, 150) if not self.is_hovered else QColor(100, 100, 110, 180)
+        base_color = QColor(80, 80, 90, 150) if not is_hovered else QColor(100, 100, 110, 180)
         
         # Draw dashed border
         pen = QPen(QColor(255, 255, 255, 150), 2, Qt.PenStyle.DashLine)
@@ -279,9 +415,23 @@ class NewProjectCard(QFrame):
         # Draw "New Project" text
         text_rect = QRect(rect.left() + 8, plus_rect.bottom() + 10, rect.width() - 16, 20)
         painter.setPen(QPen(QColor(255, 255, 255, 180), 1))
-        font = QFont("SF Pro Text", 10, QFont.Weight.Medium)
-        painter.setFont(font)
+        painter.setFont(self._FONT_NEW)
         painter.drawText(text_rect, Qt.AlignmentFlag.AlignCenter, tr("dialogs.project.new_project"))
+        
+        painter.end()
+        return pixmap
+    
+    def paintEvent(self, event):
+        """Blit the cached pixmap for the current hover state."""
+        pixmap = self._cache.get(self.is_hovered)
+        if pixmap is None:
+            pixmap = self._cache[self.is_hovered] = self._render_state_pixmap(self.is_hovered)
+        QPainter(self).drawPixmap(0, 0, pixmap)
+    
+    def resizeEvent(self, event):
+        """Drop cached pixmaps when the card size changes."""
+        self._cache.clear()
+        super().resizeEvent(event)
     
     def mousePressEvent(self, event):
         """Handle mouse press for new project creation."""
@@ -304,13 +454,18 @@ class ProjectDialog(QDialog):
     # Signal emitted when a project is deleted
     project_deleted = Signal(int)  # Emits project_id
     
+    # Shared database handle, created on first delete and reused afterwards
+    _notes_db = None
+    
     def __init__(self, projects, parent=None):
         super().__init__(parent)
         self.setWindowTitle(tr("dialogs.project.open_project"))
         self.setFixedSize(500, 600)
         self.projects = projects or []
+        self._projects_by_id = {pid: (name, filepath) for pid, name, filepath in self.projects}
         self.selected_project_id = None
         self.project_cards = []
+        self._card_by_id = {}
         
         # Glassmorphism style
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
@@ -340,33 +495,6 @@ class ProjectDialog(QDialog):
                 border: none;
                 background: transparent;
             }
-        """)
-        
-        self.setup_ui()
-    
-    def setup_ui(self):
-        """Setup the modern grid UI with scrollable area."""
-        # Clear existing layout if it exists
-        if self.layout():
-            QWidget().setLayout(self.layout())
-        
-        layout = QVBoxLayout(self)
-        layout.setSpacing(0)
-        layout.setContentsMargins(0, 0, 0, 0)
-        
-        # Create scroll area
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-        scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
-        scroll_area.setFrameShape(QFrame.Shape.NoFrame)
-        
-        # Apply thin scrollbar styling
-        scroll_area.setStyleSheet("""
-            QScrollArea {
-                border: none;
-                background: transparent;
-            }
             QScrollBar:vertical {
                 background: rgba(255, 255, 255, 0.05);
                 width: 6px;
@@ -392,36 +520,39 @@ class ProjectDialog(QDialog):
             }
         """)
         
-        # Grid container
+        self.setup_ui()
+    
+    def setup_ui(self):
+        """Setup the modern grid UI with scrollable area."""
+        layout = QVBoxLayout(self)
+        layout.setSpacing(0)
+        layout.setContentsMargins(0, 0, 0, 0)
+        
+        # Create scroll area
+        scroll_area = QScrollArea()
+        scroll_area.setWidgetResizable(True)
+        scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
+        scroll_area.setFrameShape(QFrame.Shape.NoFrame)
+        
+        # Grid container. It is painted opaque so card hover repaints stop at
+        # the grid instead of recompositing the translucent dialog behind it.
         grid_widget = QWidget()
+        grid_palette = grid_widget.palette()
+        grid_palette.setColor(QPalette.ColorRole.Window, QColor(30, 30, 30))
+        grid_widget.setPalette(grid_palette)
+        grid_widget.setAutoFillBackground(True)
         grid_layout = QGridLayout(grid_widget)
         grid_layout.setSpacing(15)
         grid_layout.setContentsMargins(15, 15, 15, 15)
         
-        # Add new project card first
-        new_card = NewProjectCard()
-        new_card.clicked.connect(self.create_new_project)
-        grid_layout.addWidget(new_card, 0, 0)
-        
-        # Add existing project cards
-        row, col = 0, 1
-        self.project_cards.clear()  # Clear the cards list before rebuilding
-        for project_id, name, filepath in self.projects:
-            if col >= 3:  # Move to next row after 3 columns
-                row += 1
-                col = 0
-            
-            card = ProjectCard(project_id, name, filepath)
-            # Fix lambda closure issue by using default parameters
-            card.clicked.connect(lambda checked=False, pid=project_id: self.open_project_directly(pid))
-            card.delete_requested.connect(lambda checked=False, pid=project_id: self.delete_project(pid))
-            self.project_cards.append(card)
-            grid_layout.addWidget(card, row, col)
-            
-            col += 1
+        self._populate_grid(grid_layout)
+        self._grid_layout = grid_layout
         
-        # Set the grid widget as the scroll area's widget
+        # Set the grid widget as the scroll area's widget; it covers the whole
+        # viewport, so the viewport never needs to paint its own background
         scroll_area.setWidget(grid_widget)
+        scroll_area.viewport().setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent)
         layout.addWidget(scroll_area)
         
         # New project input (initially hidden)
@@ -440,6 +571,37 @@ class ProjectDialog(QDialog):
         self.new_project_widget.setVisible(False)
         layout.addWidget(self.new_project_widget)
     
+    def _populate_grid(self, grid_layout, animated=False):
+        """Fill an empty grid layout with the new project card and one card per project."""
+        # Add new project card first
+        new_card = NewProjectCard()
+        new_card.clicked.connect(self.create_new_project)
+        grid_layout.addWidget(new_card, 0, 0)
+        
+        # Add existing project cards
+        row, col = 0, 1
+        self.project_cards.clear()  # Clear the cards list before rebuilding
+        self._card_by_id.clear()
+        for project_id, name, filepath in self.projects:
+            if col >= 3:  # Move to next row after 3 columns
+                row += 1
+                col = 0
+            
+            card = ProjectCard(project_id, name, filepath)
+            # Both signals already carry the project id
+            card.clicked.connect(self.open_project_directly)
+            card.delete_requested.connect(self.delete_project)
+            self.project_cards.append(card)
+            self._card_by_id[project_id] = card
+            grid_layout.addWidget(card, row, col)
+            
+            if animated:
+                # Stagger the fade-in by column
+                QTimer.singleShot(col * 50, lambda c=card: self.animate_card_appearance(c))
+            
+            col += 1
+    
+    @Slot(int)
     def open_project_directly(self, project_id):
         """Open project directly when card is clicked."""
         self.selected_project_id = project_id
@@ -485,28 +647,19 @@ class ProjectDialog(QDialog):
     def selected_project(self):
         """Return the name of the selected project (for backward compatibility)."""
         if self.selected_project_id:
-            for project_id, name, filepath in self.projects:
-                if project_id == self.selected_project_id:
-                    return name
+            project = self._projects_by_id.get(self.selected_project_id)
+            if project:
+                return project[0]
         return self.get_new_project_name()
     
+    @Slot(int)
     def delete_project(self, project_id):
         """Handle project deletion with confirmation and zoom-out animation."""
-        project_name = None
-        for pid, name, _ in self.projects:
-            if pid == project_id:
-                project_name = name
-                break
-
+        project_name, _ = self._projects_by_id.get(project_id, (None, None))
         if not project_name:
             return
 
-        card_to_delete = None
-        for card in self.project_cards:
-            if card.project_id == project_id:
-                card_to_delete = card
-                break
-
+        card_to_delete = self._card_by_id.get(project_id)
         if not card_to_delete:
             return
 
@@ -521,10 +674,6 @@ class ProjectDialog(QDialog):
         self._project_id = project_id
         self._project_name = project_name
         
-        # Create opacity effect
-        opacity_effect = QGraphicsOpacityEffect()
-        card.setGraphicsEffect(opacity_effect)
-        
         # Get current geometry
         current_rect = card.geometry()
         center = current_rect.center()
@@ -540,7 +689,7 @@ class ProjectDialog(QDialog):
         
         # Create animations
         self.scale_animation = QPropertyAnimation(card, b"geometry")
-        self.opacity_animation = QPropertyAnimation(opacity_effect, b"opacity")
+        self.opacity_animation = QPropertyAnimation(card, b"opacity")
         
         # Configure scale animation
         self.scale_animation.setDuration(400)
@@ -572,52 +721,33 @@ class ProjectDialog(QDialog):
     
     def complete_project_deletion(self, project_id, project_name, card):
         """Complete the project deletion process."""
-        print(f"DEBUG: complete_project_deletion called for project_id: {project_id}")
-        
-        # Import database manager
-        from app.services.database_manager import NotesDatabase
+        logger.debug("complete_project_deletion called for project_id: %s", project_id)
         
         # Delete from database
-        db = NotesDatabase()
-        success = db.delete_project(project_id)
-        print(f"DEBUG: Database deletion success: {success}")
+        if ProjectDialog._notes_db is None:
+            ProjectDialog._notes_db = NotesDatabase()
+        success = ProjectDialog._notes_db.delete_project(project_id)
+        logger.debug("Database deletion success: %s", success)
         
         if success:
+            self.remove_project_card(project_id)
             # Emit signal to notify parent that project was deleted
             self.project_deleted.emit(project_id)
-            print(f"DEBUG: Emitted project_deleted signal for project_id: {project_id}")
+            logger.debug("Emitted project_deleted signal for project_id: %s", project_id)
         else:
             # Show error message and restore card
-            card.setGraphicsEffect(None)  # Remove opacity effect
+            card.opacity = 1.0  # Undo the fade-out
             original_rect = QRect(card.x(), card.y(), 140, 140)  # Restore to original size
             card.setGeometry(original_rect)
             self.show_error_message(f"Failed to delete project '{project_name}'")
     
     def refresh_project_grid_animated(self):
         """Refresh the project grid layout with smooth animations."""
-        print(f"DEBUG: refresh_project_grid_animated called with {len(self.projects)} projects")
+        logger.debug("refresh_project_grid_animated called with %s projects", len(self.projects))
         
-        # Find the scroll area and grid widget
-        scroll_area = None
-        for child in self.findChildren(QScrollArea):
-            scroll_area = child
-            break
+        grid_layout = self._grid_layout
         
-        if not scroll_area:
-            print("DEBUG: No scroll area found!")
-            return
-            
-        grid_widget = scroll_area.widget()
-        if not grid_widget:
-            print("DEBUG: No grid widget found!")
-            return
-            
-        grid_layout = grid_widget.layout()
-        if not grid_layout:
-            print("DEBUG: No grid layout found!")
-            return
-        
-        print(f"DEBUG: Found layout with {grid_layout.count()} widgets")
+        logger.debug("Found layout with %s widgets", grid_layout.count())
         
         # Clear all widgets from layout
         while grid_layout.count():
@@ -625,55 +755,20 @@ class ProjectDialog(QDialog):
             if child.widget():
                 child.widget().setParent(None)
         
-        print("DEBUG: Cleared all widgets from layout")
+        logger.debug("Cleared all widgets from layout")
         
-        # Re-add new project card first
-        new_card = NewProjectCard()
-        new_card.clicked.connect(self.create_new_project)
-        grid_layout.addWidget(new_card, 0, 0)
-        print("DEBUG: Added new project card")
-        
-        # Re-add existing project cards with animation
-        self.project_cards = []  # Reset the list
-        row, col = 0, 1
-        
-        for project_id, name, filepath in self.projects:
-            if col >= 3:  # Move to next row after 3 columns
-                row += 1
-                col = 0
-            
-            print(f"DEBUG: Adding project card for {name} (ID: {project_id}) at position ({row}, {col})")
-            card = ProjectCard(project_id, name, filepath)
-            # Fix lambda closure issue by using default parameters
-            card.clicked.connect(lambda checked=False, pid=project_id: self.open_project_directly(pid))
-            card.delete_requested.connect(lambda checked=False, pid=project_id: self.delete_project(pid))
-            self.project_cards.append(card)
-            
-            # Add card to layout
-            grid_layout.addWidget(card, row, col)
-            
-            # Animate card appearance with delay - fix closure issue
-            delay = col * 50
-            QTimer.singleShot(delay, lambda c=card: self.animate_card_appearance(c))
-            
-            col += 1
+        # Re-add all cards with animation
+        self._populate_grid(grid_layout, animated=True)
         
-        print(f"DEBUG: Added {len(self.project_cards)} project cards to layout")
+        logger.debug("Added %s project cards to layout", len(self.project_cards))
         
-        # Update the layout
-        grid_widget.update()
-        scroll_area.update()
+        # One update on the dialog covers the scroll area and grid beneath it
         self.update()
-        print("DEBUG: UI update completed")
+        logger.debug("UI update completed")
     
     def animate_card_appearance(self, card):
         """Animate card appearance with fade-in effect."""
-        # Create opacity effect
-        opacity_effect = QGraphicsOpacityEffect()
-        card.setGraphicsEffect(opacity_effect)
-        
-        # Create opacity animation
-        self.appearance_animation = QPropertyAnimation(opacity_effect, b"opacity")
+        self.appearance_animation = QPropertyAnimation(card, b"opacity")
         self.appearance_animation.setDuration(300)
         self.appearance_animation.setStartValue(0.0)
         self.appearance_animation.setEndValue(1.0)
@@ -685,56 +780,23 @@ class ProjectDialog(QDialog):
         # Store animation reference to prevent garbage collection
         card._appearance_animation = self.appearance_animation
     
-    def refresh_project_grid(self):
-        """Refresh the project grid layout after deletion."""
-        # Find the scroll area and grid widget
-        scroll_area = None
-        for child in self.findChildren(QScrollArea):
-            scroll_area = child
-            break
-        
-        if not scroll_area:
-            return
-            
-        grid_widget = scroll_area.widget()
-        if not grid_widget:
-            return
-            
-        grid_layout = grid_widget.layout()
-        if not grid_layout:
+    def remove_project_card(self, project_id):
+        """Drop a deleted project's card and shift the remaining cards up."""
+        card = self._card_by_id.pop(project_id, None)
+        if card is None:
             return
         
-        # Clear the layout
-        while grid_layout.count():
-            child = grid_layout.takeAt(0)
-            if child.widget():
-                child.widget().setParent(None)
-        
-        # Re-add new project card first
-        new_card = NewProjectCard()
-        new_card.clicked.connect(self.create_new_project)
-        grid_layout.addWidget(new_card, 0, 0)
+        self.projects = [project for project in self.projects if project[0] != project_id]
+        self._projects_by_id.pop(project_id, None)
+        self.project_cards.remove(card)
+        self._grid_layout.removeWidget(card)
+        card.deleteLater()
         
-        # Re-add existing project cards
-        row, col = 0, 1
-        for project_id, name, filepath in self.projects:
-            if col >= 3:  # Move to next row after 3 columns
-                row += 1
-                col = 0
-            
-            card = ProjectCard(project_id, name, filepath)
-            # Fix lambda closure issue by using default parameters
-            card.clicked.connect(lambda checked=False, pid=project_id: self.open_project_directly(pid))
-            card.delete_requested.connect(lambda checked=False, pid=project_id: self.delete_project(pid))
-            self.project_cards.append(card)
-            grid_layout.addWidget(card, row, col)
-            
-            col += 1
-        
-        # Update the layout
-        grid_widget.update()
-        scroll_area.update()
-        self.update()
+        # Reflow the existing cards; slot 0 belongs to the new project card
+        for card in self.project_cards:
+            self._grid_layout.removeWidget(card)
+        for index, card in enumerate(self.project_cards, start=1):
+            self._grid_layout.addWidget(card, index // 3, index % 3)
     
 class ConfirmationDialog(QDialog):
     def __init__(self, project_name, parent=None):
@@ -753,6 +815,18 @@ class ConfirmationDialog(QDialog):
                 background: transparent;
                 border: none;
             }
+            QLabel#dialogTitle {
+                font-size: 18px;
+                font-weight: 600;
+            }
+            QLabel#dialogMessage {
+                font-size: 14px;
+                color: rgba(255, 255, 255, 0.9);
+            }
+            QLabel#warningLabel {
+                font-size: 12px;
+                color: rgba(255, 255, 255, 0.7);
+            }
             QPushButton {
                 background-color: rgba(255, 255, 255, 0.1);
                 border: 1px solid rgba(255, 255, 255, 0.2);
@@ -785,16 +859,16 @@ class ConfirmationDialog(QDialog):
         layout.setSpacing(16)
 
         title = QLabel(tr("dialogs.delete_project"))
-        title.setStyleSheet("font-size: 18px; font-weight: 600; color: white;")
+        title.setObjectName("dialogTitle")
         layout.addWidget(title)
 
         message = QLabel(tr("dialogs.delete_confirmation", project_name=project_name))
-        message.setStyleSheet("font-size: 14px; color: rgba(255, 255, 255, 0.9);")
+        message.setObjectName("dialogMessage")
         message.setWordWrap(True)
         layout.addWidget(message)
 
         warning = QLabel(tr("dialogs.delete_warning"))
-        warning.setStyleSheet("font-size: 12px; color: rgba(255, 255, 255, 0.7); line-height: 1.4;")
+        warning.setObjectName("warningLabel")
         layout.addWidget(warning)
 
         layout.addStretch()
@@ -814,6 +888,17 @@ class ConfirmationDialog(QDialog):
 
         cancel_btn.clicked.connect(self.reject)
         delete_btn.clicked.connect(self.accept)
+        
+        # Notification overlay, built on first use
+        self._notif_overlay = None
+        self._notif_center_dirty = True
+        
+        # Requests made in the same event-loop pass collapse into the latest
+        self._pending_notif = None
+        self._notif_coalesce_timer = QTimer(self)
+        self._notif_coalesce_timer.setSingleShot(True)
+        self._notif_coalesce_timer.setInterval(0)
+        self._notif_coalesce_timer.timeout.connect(self._flush_notification)
     
     def show_success_message(self, message):
         """Show custom success message overlay."""
@@ -823,78 +908,96 @@ class ConfirmationDialog(QDialog):
         """Show custom error message overlay."""
         self.show_notification(message, "error")
     
-    def show_notification(self, message, type_="info"):
-        """Show custom notification overlay."""
-        # Create overlay widget
+    def _ensure_notification_overlay(self):
+        """Build the notification overlay once and reuse it for later messages."""
+        if self._notif_overlay is not None:
+            return
+        
+        # Dim backdrop covering the dialog; it also keeps clicks off the
+        # dialog's own buttons while a notification is showing
         overlay = QWidget(self)
-        overlay.setStyleSheet("background-color: rgba(0, 0, 0, 0.5);")
-        overlay.resize(self.size())
-        overlay.show()
+        overlay.setStyleSheet(_OVERLAY_QSS)
+        overlay.setMouseTracking(False)
+        overlay.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent, False)
         
         # Create notification
         notification = QWidget(overlay)
         notification.setFixedSize(320, 120)
         
-        color = "rgba(40, 167, 69, 0.9)" if type_ == "success" else "rgba(220, 53, 69, 0.9)"
-        
-        notification.setStyleSheet(f"""
-            QWidget {{
-                background-color: {color};
-                border-radius: 8px;
-            }}
-            QLabel {{
-                color: white;
-                background: transparent;
-                border: none;
-                font-size: 14px;
-                font-weight: 500;
-            }}
-            QPushButton {{
-                background-color: rgba(255, 255, 255, 0.2);
-                border: 1px solid rgba(255, 255, 255, 0.3);
-                border-radius: 4px;
-                color: white;
-                font-size: 12px;
-                padding: 6px 12px;
-            }}
-            QPushButton:hover {{
-                background-color: rgba(255, 255, 255, 0.3);
-            }}
-        """)
-        
-        # Center the notification
-        notification.move(
-            (overlay.width() - notification.width()) // 2,
-            (overlay.height() - notification.height()) // 2
-        )
-        
-        # Layout
-        layout = QVBoxLayout(notification)
-        layout.setContentsMargins(20, 20, 20, 20)
-        layout.setSpacing(12)
-        
-        # Message
-        msg_label = QLabel(message)
+        # Fixed-size panel, so children are placed directly instead of
+        # running the layout engine on every message
+        msg_label = QLabel(notification)
+        msg_label.setTextFormat(Qt.TextFormat.PlainText)
         msg_label.setWordWrap(True)
         msg_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        layout.addWidget(msg_label)
+        msg_label.setGeometry(20, 20, 280, 40)
         
         # OK button
-        ok_btn = QPushButton(tr("buttons.ok"))
-        ok_btn.clicked.connect(overlay.close)
+        ok_btn = QPushButton(tr("buttons.ok"), notification)
+        ok_btn.setGeometry(110, 72, 100, 28)
+        ok_btn.clicked.connect(self._close_notification)
+        
+        # Auto-close timer, owned by the dialog so it outlives this call
+        timer = QTimer(self)
+        timer.setSingleShot(True)
+        timer.timeout.connect(self._close_notification)
+        
+        self._notif_overlay = overlay
+        self._notif_widget = notification
+        self._notif_label = msg_label
+        self._notif_ok_btn = ok_btn
+        self._notif_timer = timer
+    
+    @Slot()
+    def _close_notification(self):
+        """Dismiss the notification and its dim backdrop."""
+        # Hide rather than close so the overlay is simply shown again next time
+        self._notif_overlay.hide()
+    
+    def resizeEvent(self, event):
+        """Mark the overlay for re-layout on the next notification."""
+        self._notif_center_dirty = True
+        super().resizeEvent(event)
+    
+    def show_notification(self, message, type_="info"):
+        """Show custom notification overlay."""
+        self._pending_notif = (message, type_)
+        # While hidden nobody would see it; showEvent picks it up instead
+        if self.isVisible():
+            self._notif_coalesce_timer.start()
+    
+    def showEvent(self, event):
+        """Show a notification requested while the dialog was hidden."""
+        super().showEvent(event)
+        if self._pending_notif is not None:
+            self._notif_coalesce_timer.start()
+    
+    @Slot()
+    def _flush_notification(self):
+        """Show the most recent pending notification."""
+        if self._pending_notif is None or not self.isVisible():
+            return
+        message, type_ = self._pending_notif
+        self._pending_notif = None
+        
+        self._ensure_notification_overlay()
+        overlay = self._notif_overlay
+        notification = self._notif_widget
         
-        btn_layout = QHBoxLayout()
-        btn_layout.addStretch()
-        btn_layout.addWidget(ok_btn)
-        btn_layout.addStretch()
+        self._notif_label.setText(message)
+        notification.setStyleSheet(_NOTIFY_QSS.get(type_, _NOTIFY_QSS["error"]))
         
-        layout.addLayout(btn_layout)
+        # Fit the overlay and center the notification; only needed again after a resize
+        if self._notif_center_dirty:
+            overlay.resize(self.size())
+            notification.move(
+                (overlay.width() - notification.width()) // 2,
+                (overlay.height() - notification.height()) // 2
+            )
+            self._notif_center_dirty = False
         
-        notification.show()
+        overlay.show()
+        overlay.raise_()
         
         # Auto-close after 3 seconds
-        from PySide6.QtCore import QTimer
-        timer = QTimer()
-        timer.timeout.connect(overlay.close)
-        timer.setSingleShot(True)
-        timer.start(3000)
\ No newline at end of file
+        self._notif_timer.start(3000)
@@ -2,95 +2,250 @@
 
 import os
 import re
+from bisect import bisect_right
+from functools import lru_cache
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QTextEdit, QPushButton, QFrame, 
     QLabel, QScrollArea, QSizePolicy, QApplication
 )
 from PySide6.QtGui import (
-    QIcon, QTextDocument, QTextCursor, QTextCharFormat, QFont, QPalette, QColor,
-    QPainter, QConicalGradient, QPen
+    QIcon, QTextDocument, QTextCursor, QTextCharFormat, QTextFormat, QFont, QPalette, QColor,
+    QPainter, QConicalGradient, QPen, QPixmap
 )
 from PySide6.QtCore import QSize, Qt, Signal, QTimer, QPointF
 
 # Import theme detection
-from app.utils.app_utils import detect_system_theme
+from app.utils.app_utils import detect_system_theme, create_themed_icon_pixmap
+
+# A complete <think>...</think> block in saved content
+_THINK_BLOCK_RE = re.compile(r'<think>(.*?)</think>', re.DOTALL)
+
+# Marks text formatted as inline code by the toolbar
+_CODE_PROP = QTextFormat.Property.UserProperty.value + 1
+
+# Whitespace/punctuation after which streamed text can be flushed
+_WORD_BOUNDARY_CHARS = (' ', '\n', '\t', '\r', '\f', '\v', '.', '!', '?', ';', ',')
+# Deletes every boundary character, so text is unchanged only if it has none
+_WORD_BOUNDARY_DELETE = str.maketrans('', '', ''.join(_WORD_BOUNDARY_CHARS))
+
+_ICONS_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "icons")
+_AI_ICON_PATH = os.path.join(_ICONS_DIR, "ai.svg")
+_COPY_ICON_PATH = os.path.join(_ICONS_DIR, "copy.svg")
+
+# Main editor, with a thin scrollbar without arrows
+_EDITOR_QSS = """
+    QTextEdit {
+        background: transparent;
+        border: 1px solid rgba(255, 255, 255, 0.2);
+        border-radius: 6px;
+        padding: 8px;
+        color: rgba(255, 255, 255, 0.9);
+        font-family: 'SF Pro Text', 'Segoe UI', sans-serif;
+        font-size: 13px;
+    }
+    QTextEdit QScrollBar:vertical {
+        background: rgba(255, 255, 255, 0.1);
+        width: 6px;
+        border-radius: 3px;
+    }
+    QTextEdit QScrollBar::handle:vertical {
+        background: rgba(255, 255, 255, 0.3);
+        border-radius: 3px;
+        min-height: 20px;
+    }
+    QTextEdit QScrollBar::handle:vertical:hover {
+        background: rgba(255, 255, 255, 0.5);
+    }
+    QTextEdit QScrollBar::add-line:vertical, QTextEdit QScrollBar::sub-line:vertical {
+        height: 0px;
+        border: none;
+        background: none;
+    }
+    QTextEdit QScrollBar::add-page:vertical, QTextEdit QScrollBar::sub-page:vertical {
+        background: none;
+    }
+"""
+
+# Thinking widget shown above the editor content
+_THINKING_WIDGET_QSS = """
+    #thinking_widget {
+        background: rgba(128, 128, 128, 0.1);
+        border: 1px solid rgba(128, 128, 128, 0.3);
+        border-radius: 4px;
+        margin: 6px;
+    }
+"""
+
+# Thinking content - smaller, grey text
+_THINKING_TEXT_QSS = """
+    QTextEdit {
+        background: transparent;
+        border: none;
+        color: rgba(255, 255, 255, 0.6);
+        font-size: 11px;
+        padding: 8px 10px;
+        line-height: 1.4;
+    }
+"""
+
+# Small circular expand button
+_EXPAND_BTN_QSS = """
+    QPushButton {
+        background: rgba(128, 128, 128, 0.2);
+        border: 1px solid rgba(128, 128, 128, 0.4);
+        border-radius: 8px;
+        color: rgba(255, 255, 255, 0.8);
+        font-size: 8px;
+        font-weight: bold;
+    }
+    QPushButton:hover {
+        background: rgba(128, 128, 128, 0.3);
+        border-color: rgba(128, 128, 128, 0.6);
+        color: rgba(255, 255, 255, 1.0);
+    }
+    QPushButton:pressed {
+        background: rgba(128, 128, 128, 0.4);
+    }
+"""
+
+# Toolbar format buttons
+_BUTTON_QSS = """
+    QPushButton {
+        background: rgba(255, 255, 255, 0.1);
+        border: 1px solid rgba(255, 255, 255, 0.2);
+        border-radius: 4px;
+        color: rgba(255, 255, 255, 0.8);
+        font-weight: bold;
+    }
+    QPushButton:hover {
+        background: rgba(255, 255, 255, 0.2);
+        color: rgba(255, 255, 255, 1.0);
+    }
+    QPushButton:checked {
+        background: rgba(100, 150, 255, 0.3);
+        border-color: rgba(100, 150, 255, 0.5);
+    }
+"""
+
+_AI_QSS = """
+    QPushButton {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+            stop:0 #FF0080, stop:1 #00D4FF);
+        border: 1px solid transparent;
+        border-radius: 4px;
+        color: white;
+    }
+    QPushButton:hover {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+            stop:0 #FF1493, stop:1 #00BFFF);
+        border: 1px solid rgba(255, 255, 255, 0.3);
+        color: white;
+    }
+    QPushButton:pressed {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+            stop:0 #DC143C, stop:1 #0099CC);
+        border: 1px solid rgba(255, 255, 255, 0.5);
+        color: white;
+    }
+"""
+
+_STOP_QSS = """
+    QPushButton {
+        background: rgba(255, 100, 100, 0.2);
+        border: 1px solid rgba(255, 100, 100, 0.4);
+        border-radius: 4px;
+        color: rgba(255, 255, 255, 0.9);
+        font-weight: bold;
+    }
+    QPushButton:hover {
+        background: rgba(255, 100, 100, 0.3);
+        border-color: rgba(255, 100, 100, 0.6);
+        color: rgba(255, 255, 255, 1.0);
+    }
+"""
+
+# Copy button for code blocks
+_COPY_BTN_QSS = """
+    QPushButton {
+        background: rgba(255, 255, 255, 0.1);
+        border: 1px solid rgba(255, 255, 255, 0.2);
+        border-radius: 4px;
+    }
+    QPushButton:hover {
+        background: rgba(255, 255, 255, 0.2);
+    }
+"""
+
+
+@lru_cache(maxsize=8)
+def _get_ai_icon(theme):
+    """Build the AI button icon once per theme; None if the SVG is missing."""
+    if not os.path.exists(_AI_ICON_PATH):
+        return None
+    pixmap = create_themed_icon_pixmap(_AI_ICON_PATH, size=16, theme=theme)
+    return QIcon(pixmap) if pixmap else QIcon(_AI_ICON_PATH)
+
+
+@lru_cache(maxsize=1)
+def _get_copy_icon():
+    """Build the code block copy icon once."""
+    return QIcon(_COPY_ICON_PATH)
 
 
 class MarkdownTextEdit(QTextEdit):
     """Custom QTextEdit that renders markdown without showing markers."""
     selection_format_changed = Signal(QTextCharFormat)
-
-    # Pre-compile markdown patterns for efficiency
-    MARKDOWN_PATTERNS = [
-        re.compile(r'\*\*.*?\*\*'),       # Bold
-        re.compile(r'\*.*?\*'),           # Italic
-        re.compile(r'`.*?`'),             # Inline code
-        re.compile(r'```.*?```', re.DOTALL), # Code blocks
-        re.compile(r'^#{1,6}\s', re.MULTILINE), # Headers
-        re.compile(r'^\*\s', re.MULTILINE),     # Bullet points
-        re.compile(r'^\d+\.\s', re.MULTILINE),  # Numbered lists
-    ]
+    thinking_text_changed = Signal()
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self.raw_text = ""
-        self.is_updating = False
         self.last_cursor_position = 0
         self.thinking_content = ""
         self.thinking_widget = None
+        self.thinking_text = None
+        self._thinking_positioned = False
+        self._last_fmt_sig = None
+        self._last_auto_resize_key = None
+
+        # Streamed thinking chunks are batched and inserted at most once per frame
+        self._pending_thinking = []
+        self._thinking_flush_timer = QTimer(self)
+        self._thinking_flush_timer.setSingleShot(True)
+        self._thinking_flush_timer.setInterval(16)
+        self._thinking_flush_timer.timeout.connect(self.flush_thinking_content)
 
         # Remove the render timer to avoid cursor jumping issues
         
         # Reset any default document margins to ensure normal text positioning
         self.document().setDocumentMargin(0)
         
-        self.setup_thinking_widget()
+        # Block numbers of ``` fence lines, kept in sync with edits
+        self._fence_blocks = []
+        self._block_count = self.document().blockCount()
+        self.document().contentsChange.connect(self._update_fence_index)
+        
+        # The thinking widget is only built once thinking content arrives
         self.textChanged.connect(self.on_text_changed)
         self.cursorPositionChanged.connect(self.on_cursor_position_changed)
         
         # Configure scrollbar to be thin without arrows and start with minimal padding
-        self.setStyleSheet("""
-            QTextEdit {
-                background: transparent;
-                border: 1px solid rgba(255, 255, 255, 0.2);
-                border-radius: 6px;
-                padding: 8px;
-                color: rgba(255, 255, 255, 0.9);
-                font-family: 'SF Pro Text', 'Segoe UI', sans-serif;
-                font-size: 13px;
-            }
-            QTextEdit QScrollBar:vertical {
-                background: rgba(255, 255, 255, 0.1);
-                width: 6px;
-                border-radius: 3px;
-            }
-            QTextEdit QScrollBar::handle:vertical {
-                background: rgba(255, 255, 255, 0.3);
-                border-radius: 3px;
-                min-height: 20px;
-            }
-            QTextEdit QScrollBar::handle:vertical:hover {
-                background: rgba(255, 255, 255, 0.5);
-            }
-            QTextEdit QScrollBar::add-line:vertical, QTextEdit QScrollBar::sub-line:vertical {
-                height: 0px;
-                border: none;
-                background: none;
-            }
-            QTextEdit QScrollBar::add-page:vertical, QTextEdit QScrollBar::sub-page:vertical {
-                background: none;
-            }
-        """)
+        self.setStyleSheet(_EDITOR_QSS)
 
     def on_cursor_position_changed(self):
-        """Emit signal with the format of the current selection."""
-        self.selection_format_changed.emit(self.currentCharFormat())
+        """Emit signal with the format of the current selection when it changes."""
+        fmt = self.currentCharFormat()
+        fmt_sig = (fmt.fontWeight(), fmt.fontItalic(), fmt.boolProperty(_CODE_PROP))
+        if fmt_sig == self._last_fmt_sig:
+            return
+        self._last_fmt_sig = fmt_sig
+        self.selection_format_changed.emit(fmt)
     
     def update_layout_spacing(self):
         """Update the main editor margins based on thinking widget visibility."""
         # Check if thinking widget should be visible (has content or is explicitly visible)
-        has_thinking_content = (hasattr(self, 'thinking_text') and 
-                               hasattr(self, 'thinking_widget') and
+        has_thinking_content = (self.thinking_text is not None and
+                               self.thinking_widget is not None and
                                (self.thinking_widget.isVisible() or 
                                 (self.thinking_text.toPlainText().strip() != "")))
         
@@ -100,31 +255,21 @@ class MarkdownTextEdit(QTextEdit):
             margin_top = self.thinking_widget.height() + 8
             # Ensure the widget is actually visible
             if not self.thinking_widget.isVisible():
+                self.position_thinking_widget()
                 self.thinking_widget.setVisible(True)
-                self.thinking_widget.setGeometry(10, 10, self.width() - 20, self.thinking_widget.height())
         else:
             # Thinking widget is hidden, use normal editor padding
             margin_top = 0  # No extra margin needed, just use the editor's natural padding
         
-        # Use viewport margins to only affect the top, keeping full width
+        # Use viewport margins to only affect the top, keeping full width;
+        # this schedules its own relayout and repaint
         self.setViewportMargins(0, margin_top, 0, 0)
-        
-        # Force a repaint to ensure the change takes effect
-        self.update()
-        self.repaint()
 
     def setup_thinking_widget(self):
         """Setup the thinking widget inside the text edit."""
         self.thinking_widget = QWidget(self)
         self.thinking_widget.setObjectName("thinking_widget")
-        self.thinking_widget.setStyleSheet("""
-            #thinking_widget {
-                background: rgba(128, 128, 128, 0.1);
-                border: 1px solid rgba(128, 128, 128, 0.3);
-                border-radius: 4px;
-                margin: 6px;
-            }
-        """)
+        self.thinking_widget.setStyleSheet(_THINKING_WIDGET_QSS)
         
         # Layout for thinking widget
         layout = QVBoxLayout(self.thinking_widget)
@@ -143,18 +288,10 @@ class MarkdownTextEdit(QTextEdit):
         
         # Auto-resize based on content
         self.thinking_text.document().contentsChanged.connect(self.auto_resize_thinking_widget)
+        self.thinking_text.textChanged.connect(self.thinking_text_changed)
         
         # Styling for thinking content - smaller, grey text
-        self.thinking_text.setStyleSheet("""
-            QTextEdit {
-                background: transparent;
-                border: none;
-                color: rgba(255, 255, 255, 0.6);
-                font-size: 11px;
-                padding: 8px 10px;
-                line-height: 1.4;
-            }
-        """)
+        self.thinking_text.setStyleSheet(_THINKING_TEXT_QSS)
         
         # Set font - smaller and lighter
         font = QFont()
@@ -175,24 +312,7 @@ class MarkdownTextEdit(QTextEdit):
         self.expand_btn = QPushButton()
         self.expand_btn.setFixedSize(16, 16)
         self.expand_btn.setVisible(True)  # Always visible when thinking widget is shown
-        self.expand_btn.setStyleSheet("""
-            QPushButton {
-                background: rgba(128, 128, 128, 0.2);
-                border: 1px solid rgba(128, 128, 128, 0.4);
-                border-radius: 8px;
-                color: rgba(255, 255, 255, 0.8);
-                font-size: 8px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background: rgba(128, 128, 128, 0.3);
-                border-color: rgba(128, 128, 128, 0.6);
-                color: rgba(255, 255, 255, 1.0);
-            }
-            QPushButton:pressed {
-                background: rgba(128, 128, 128, 0.4);
-            }
-        """)
+        self.expand_btn.setStyleSheet(_EXPAND_BTN_QSS)
         self.expand_btn.clicked.connect(self.toggle_thinking_expand)
         
         # Initialize state before calling update_expand_button_icon
@@ -205,19 +325,28 @@ class MarkdownTextEdit(QTextEdit):
         
         self.thinking_widget.setFixedHeight(95)  # Updated to match new minimum + margin
         self.thinking_widget.setVisible(False)
-        
-        # Initialize layout spacing
-        self.update_layout_spacing()
+
+    def _ensure_thinking_widget(self):
+        """Build the thinking widget on first use and return it."""
+        if self.thinking_widget is None:
+            self.setup_thinking_widget()
+        return self.thinking_widget
 
     def auto_resize_thinking_widget(self):
         """Auto-resize thinking widget based on content."""
-        if not hasattr(self, 'thinking_text') or not self.thinking_widget.isVisible():
+        if self.thinking_text is None or not self.thinking_widget.isVisible():
             return
         
         # Get the document height
         doc = self.thinking_text.document()
         doc_height = doc.size().height()
         
+        # Nothing to do if neither the content height nor the expand state changed
+        key = (int(doc_height), self._thinking_expanded)
+        if key == self._last_auto_resize_key:
+            return
+        self._last_auto_resize_key = key
+        
         # Add padding and button container height (accounting for improved spacing)
         total_height = int(doc_height) + 35  # 35px for padding, margins, and button
         
@@ -231,7 +360,8 @@ class MarkdownTextEdit(QTextEdit):
         current_height = self.thinking_widget.height()
         if abs(final_height - current_height) > 5:
             self.thinking_widget.setFixedHeight(final_height)
-            self.thinking_text.setFixedHeight(final_height - 35)
+            if self.thinking_text.height() != final_height - 35:
+                self.thinking_text.setFixedHeight(final_height - 35)
             self.update_layout_spacing()
 
     def toggle_thinking_expand(self):
@@ -261,52 +391,79 @@ class MarkdownTextEdit(QTextEdit):
     def resizeEvent(self, event):
         """Handle resize events to reposition thinking widget."""
         super().resizeEvent(event)
-        if hasattr(self, 'thinking_widget') and self.thinking_widget:
+        if self.thinking_widget is not None:
             # Position thinking widget at the top with better margins
             self.thinking_widget.setGeometry(10, 10, self.width() - 20, self.thinking_widget.height())
+            self._thinking_positioned = True
+
+    def position_thinking_widget(self):
+        """Place the thinking widget at the top of the editor if it isn't already."""
+        self._ensure_thinking_widget()
+        if self._thinking_positioned:
+            return
+        self.thinking_widget.setGeometry(10, 10, self.width() - 20, self.thinking_widget.height())
+        self._thinking_positioned = True
 
     def clear_thinking(self):
         """Clear thinking content and hide widget."""
-        if hasattr(self, 'thinking_text'):
-            self.thinking_text.clear()
-        if hasattr(self, 'thinking_widget'):
-            self.thinking_widget.setVisible(False)
+        self._pending_thinking.clear()
+        self._thinking_flush_timer.stop()
+        if self.thinking_widget is None:
+            return
+        self._thinking_positioned = False
+        self._last_auto_resize_key = None
+        self.thinking_text.clear()
+        self.thinking_widget.setVisible(False)
         self.update_layout_spacing()
 
     def append_thinking_content(self, chunk):
-        """Append content to thinking widget."""
-        if hasattr(self, 'thinking_text'):
-            # Position thinking widget if not already positioned
-            if not self.thinking_widget.isVisible():
-                self.thinking_widget.setGeometry(10, 10, self.width() - 20, self.thinking_widget.height())
-            
-            # Append content
-            cursor = self.thinking_text.textCursor()
-            cursor.movePosition(QTextCursor.MoveOperation.End)
-            cursor.insertText(chunk)
-            
-            # Update layout spacing (this will handle visibility)
-            self.update_layout_spacing()
-            
-            # The auto-resize will be triggered by the document contentsChanged signal
+        """Queue content for the thinking widget; it is inserted on the next flush."""
+        self._pending_thinking.append(chunk)
+        if not self._thinking_flush_timer.isActive():
+            self._thinking_flush_timer.start()
+
+    def flush_thinking_content(self):
+        """Insert all queued thinking chunks in a single edit."""
+        self._thinking_flush_timer.stop()
+        if not self._pending_thinking:
+            return
+        
+        # Build and position thinking widget if not already done
+        self.position_thinking_widget()
+        
+        # Append content
+        cursor = self.thinking_text.textCursor()
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.insertText("".join(self._pending_thinking))
+        self._pending_thinking.clear()
+        
+        # Update layout spacing (this will handle visibility); contentsChanged already
+        # resized the widget, but only after this does the size account for the layout
+        self.update_layout_spacing()
+        self.auto_resize_thinking_widget()
 
     def set_thinking_content(self, content):
         """Set thinking content and show widget."""
-        if hasattr(self, 'thinking_text'):
-            self.thinking_text.setPlainText(content)
-            # Position thinking widget
-            self.thinking_widget.setGeometry(10, 10, self.width() - 20, self.thinking_widget.height())
-            # Update layout spacing (this will handle visibility)
-            self.update_layout_spacing()
+        self._pending_thinking.clear()
+        self._thinking_flush_timer.stop()
+        self._ensure_thinking_widget()
+        self.thinking_text.setPlainText(content)
+        # Position thinking widget
+        self.position_thinking_widget()
+        # Update layout spacing (this will handle visibility)
+        self.update_layout_spacing()
 
     def set_raw_text(self, text):
         """Set the raw text content."""
         self.raw_text = text
-        self.is_updating = True
         # Store cursor position before setting text
         cursor = self.textCursor()
         cursor_position = cursor.position()
         
+        # Replace the text without the textChanged/contentsChanged/cursor cascade
+        doc = self.document()
+        doc_was_blocked = doc.blockSignals(True)
+        was_blocked = self.blockSignals(True)
         self.setPlainText(text)
         
         # Restore cursor position if valid
@@ -314,27 +471,51 @@ class MarkdownTextEdit(QTextEdit):
             cursor.setPosition(cursor_position)
             self.setTextCursor(cursor)
         
-        self.is_updating = False
+        self.blockSignals(was_blocked)
+        doc.blockSignals(doc_was_blocked)
+        self._update_fence_index(0, 0, len(text))
+        
+        # Let the toolbar and copy button pick up the new cursor context once
+        self.cursorPositionChanged.emit()
+
+    def _update_fence_index(self, position, chars_removed, chars_added):
+        """Rescan the blocks touched by an edit for ``` fences and shift the rest."""
+        doc = self.document()
+        first = doc.findBlock(position).blockNumber()
+        last_block = doc.findBlock(position + chars_added)
+        last = last_block.blockNumber() if last_block.isValid() else doc.blockCount() - 1
+        delta = doc.blockCount() - self._block_count
+        self._block_count = doc.blockCount()
+        old_last = last - delta
+        
+        fences = [n for n in self._fence_blocks if n < first]
+        block = doc.findBlockByNumber(first)
+        while block.isValid() and block.blockNumber() <= last:
+            if block.text().lstrip().startswith('```'):
+                fences.append(block.blockNumber())
+            block = block.next()
+        fences.extend(n + delta for n in self._fence_blocks if n > old_last)
+        self._fence_blocks = fences
+
+    def code_block_range(self, block_number):
+        """Return (opening, closing) fence block numbers around a block, or None.
+        
+        An unclosed fence runs to the end of the document, so closing is then the block count.
+        """
+        fences = self._fence_blocks
+        index = bisect_right(fences, block_number)
+        if index % 2:
+            # On or after an opening fence
+            closing = fences[index] if index < len(fences) else self.document().blockCount()
+            return fences[index - 1], closing
+        if index and fences[index - 1] == block_number:
+            # On a closing fence
+            return fences[index - 2], block_number
+        return None
 
     def on_text_changed(self):
         """Handle text changes - just update raw_text without any rendering."""
-        if not self.is_updating:
-            self.raw_text = self.toPlainText()
-
-    def text_needs_formatting(self, text):
-        """Check if text contains markdown that needs formatting."""
-        # Disabled for now to keep editor simple
-        return False
-
-    def update_display(self):
-        """Update the display - simplified to avoid cursor jumping."""
-        # Do nothing to avoid cursor position issues
-        pass
-    
-    def render_markdown(self):
-        """Render markdown content in the text editor."""
-        # Disabled to keep editor as simple plain text editor
-        pass
+        self.raw_text = self.toPlainText()
 
 
 class AnimatedAIButton(QPushButton):
@@ -347,9 +528,23 @@ class AnimatedAIButton(QPushButton):
         self.animation_timer.timeout.connect(self.update_rotation)
         self.is_animating = False
         
+        # Gradient and pen are built once; each frame only changes the angle
+        self._gradient = QConicalGradient(QPointF(self.width() / 2, self.height() / 2), 0.0)
+        self._gradient.setColorAt(0.0, QColor(255, 0, 128, 255))    # Bright pink
+        self._gradient.setColorAt(0.25, QColor(0, 212, 255, 255))   # Bright cyan
+        self._gradient.setColorAt(0.5, QColor(255, 0, 128, 255))    # Bright pink
+        self._gradient.setColorAt(0.75, QColor(0, 212, 255, 255))   # Bright cyan
+        self._gradient.setColorAt(1.0, QColor(255, 0, 128, 255))    # Bright pink
+        self._pen = QPen()
+        self._pen.setWidth(2)
+        # One pre-rendered border per 5 degree step, filled in as they're first shown
+        self._frames = None
+        
     def start_border_animation(self):
         """Start the rotating border animation."""
         if not self.is_animating:
+            if self._frames is None:
+                self._frames = [None] * (360 // 5)
             self.is_animating = True
             self.animation_timer.start(50)  # Update every 50ms for smooth animation
             
@@ -365,30 +560,53 @@ class AnimatedAIButton(QPushButton):
         """Update rotation angle and repaint."""
         self.rotation_angle = (self.rotation_angle + 5) % 360
         self.update()
+
+    def showEvent(self, event):
+        """Resume a running animation that was paused while hidden."""
+        super().showEvent(event)
+        if self.is_animating and not self.animation_timer.isActive():
+            self.animation_timer.start(50)
+
+    def hideEvent(self, event):
+        """Pause the animation timer while the button can't be seen."""
+        super().hideEvent(event)
+        if self.is_animating:
+            self.animation_timer.stop()
+
+    def resizeEvent(self, event):
+        """Keep the gradient centered and drop frames rendered at the old size."""
+        super().resizeEvent(event)
+        self._gradient.setCenter(QPointF(self.width() / 2, self.height() / 2))
+        if self._frames is not None:
+            self._frames = [None] * (360 // 5)
+
+    def _render_frame(self, angle):
+        """Render the rotating border at the given angle onto a transparent pixmap."""
+        ratio = self.devicePixelRatioF()
+        pixmap = QPixmap(self.size() * ratio)
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        self._gradient.setAngle(angle)
+        self._pen.setBrush(self._gradient)
+        painter.setPen(self._pen)
+        painter.drawRoundedRect(1, 1, self.width() - 2, self.height() - 2, 4, 4)
+        painter.end()
+        return pixmap
         
     def paintEvent(self, event):
         """Custom paint event to draw rotating border."""
         super().paintEvent(event)
         
         if self.is_animating:
+            index = self.rotation_angle // 5
+            frame = self._frames[index]
+            if frame is None:
+                frame = self._frames[index] = self._render_frame(self.rotation_angle)
             painter = QPainter(self)
-            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-            
-            # Create rotating gradient
-            center = QPointF(self.width() / 2, self.height() / 2)
-            gradient = QConicalGradient(center, self.rotation_angle)
-            gradient.setColorAt(0.0, QColor(255, 0, 128, 255))    # Bright pink
-            gradient.setColorAt(0.25, QColor(0, 212, 255, 255))   # Bright cyan
-            gradient.setColorAt(0.5, QColor(255, 0, 128, 255))    # Bright pink
-            gradient.setColorAt(0.75, QColor(0, 212, 255, 255))   # Bright cyan
-            gradient.setColorAt(1.0, QColor(255, 0, 128, 255))    # Bright pink
-            
-            # Draw rotating border
-            pen = QPen()
-            pen.setBrush(gradient)
-            pen.setWidth(2)
-            painter.setPen(pen)
-            painter.drawRoundedRect(1, 1, self.width() - 2, self.height() - 2, 4, 4)
+            painter.drawPixmap(0, 0, frame)
 
 
 class MarkdownToolbar(QWidget):
@@ -433,16 +651,10 @@ class MarkdownToolbar(QWidget):
 
         # AI button
         self.ai_btn = AnimatedAIButton()
-        icon_path = os.path.join(os.path.dirname(__file__), "..", "..", "icons", "ai.svg")
-        if os.path.exists(icon_path):
-            # Import the themed icon function
-            from app.utils.app_utils import create_themed_icon_pixmap
-            # Create white-themed icon for the AI button to match primary button
-            white_icon_pixmap = create_themed_icon_pixmap(icon_path, size=16, theme='dark')  # Use dark theme to get white icon
-            if white_icon_pixmap:
-                self.ai_btn.setIcon(QIcon(white_icon_pixmap))
-            else:
-                self.ai_btn.setIcon(QIcon(icon_path))
+        # White-themed icon to match the primary button (dark theme gives a white icon)
+        ai_icon = _get_ai_icon('dark')
+        if ai_icon is not None:
+            self.ai_btn.setIcon(ai_icon)
         else:
             self.ai_btn.setText("AI")
         self.ai_btn.setIconSize(QSize(16, 16))
@@ -462,72 +674,17 @@ class MarkdownToolbar(QWidget):
 
     def apply_styles(self):
         """Apply button styles."""
-        button_style = """
-            QPushButton {
-                background: rgba(255, 255, 255, 0.1);
-                border: 1px solid rgba(255, 255, 255, 0.2);
-                border-radius: 4px;
-                color: rgba(255, 255, 255, 0.8);
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background: rgba(255, 255, 255, 0.2);
-                color: rgba(255, 255, 255, 1.0);
-            }
-            QPushButton:checked {
-                background: rgba(100, 150, 255, 0.3);
-                border-color: rgba(100, 150, 255, 0.5);
-            }
-        """
-        
-        ai_style = """
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                    stop:0 #FF0080, stop:1 #00D4FF);
-                border: 1px solid transparent;
-                border-radius: 4px;
-                color: white;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                    stop:0 #FF1493, stop:1 #00BFFF);
-                border: 1px solid rgba(255, 255, 255, 0.3);
-                color: white;
-            }
-            QPushButton:pressed {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                    stop:0 #DC143C, stop:1 #0099CC);
-                border: 1px solid rgba(255, 255, 255, 0.5);
-                color: white;
-            }
-        """
-        
-        stop_style = """
-            QPushButton {
-                background: rgba(255, 100, 100, 0.2);
-                border: 1px solid rgba(255, 100, 100, 0.4);
-                border-radius: 4px;
-                color: rgba(255, 255, 255, 0.9);
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background: rgba(255, 100, 100, 0.3);
-                border-color: rgba(255, 100, 100, 0.6);
-                color: rgba(255, 255, 255, 1.0);
-            }
-        """
-        
-        self.bold_btn.setStyleSheet(button_style)
-        self.italic_btn.setStyleSheet(button_style)
-        self.code_btn.setStyleSheet(button_style)
-        self.ai_btn.setStyleSheet(ai_style)
-        self.stop_btn.setStyleSheet(stop_style)
+        self.bold_btn.setStyleSheet(_BUTTON_QSS)
+        self.italic_btn.setStyleSheet(_BUTTON_QSS)
+        self.code_btn.setStyleSheet(_BUTTON_QSS)
+        self.ai_btn.setStyleSheet(_AI_QSS)
+        self.stop_btn.setStyleSheet(_STOP_QSS)
 
     def update_format_buttons(self, fmt: QTextCharFormat):
         """Update button states based on character format."""
         self.bold_btn.setChecked(fmt.fontWeight() == QFont.Weight.Bold)
         self.italic_btn.setChecked(fmt.fontItalic())
-        self.code_btn.setChecked(fmt.background() == Qt.GlobalColor.darkGray)
+        self.code_btn.setChecked(fmt.boolProperty(_CODE_PROP))
         
     def start_ai_animation(self):
         """Start AI button border animation."""
@@ -545,6 +702,9 @@ class MarkdownEditor(QWidget):
     ai_request = Signal()
     stop_request = Signal()
 
+    # Opening and closing think tags in the AI stream
+    _THINK_TAG_RE = re.compile(r'<think>|</think>')
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setup_ui()
@@ -573,46 +733,66 @@ class MarkdownEditor(QWidget):
         # Ensure the MarkdownEditor itself uses full width
         self.setMinimumWidth(0)
         self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
-        
-        self.setStyleSheet("""
-            QTextEdit {
-                background: transparent;
-                border: 1px solid rgba(255, 255, 255, 0.2);
-                border-radius: 6px;
-                padding: 8px;
-                color: rgba(255, 255, 255, 0.9);
-                font-family: 'SF Pro Text', 'Segoe UI', sans-serif;
-                font-size: 13px;
-            }
-        """)
 
         # Copy button for code blocks
         self.copy_button = QPushButton()
-        icon_path = os.path.join(os.path.dirname(__file__), "..", "..", "icons", "copy.svg")
-        self.copy_button.setIcon(QIcon(icon_path))
+        self.copy_button.setIcon(_get_copy_icon())
         self.copy_button.setIconSize(QSize(16, 16))
         self.copy_button.setFixedSize(28, 28)
-        self.copy_button.setStyleSheet("""
-            QPushButton {
-                background: rgba(255, 255, 255, 0.1);
-                border: 1px solid rgba(255, 255, 255, 0.2);
-                border-radius: 4px;
-            }
-            QPushButton:hover {
-                background: rgba(255, 255, 255, 0.2);
-            }
-        """)
+        self.copy_button.setStyleSheet(_COPY_BTN_QSS)
         self.copy_button.setParent(self.text_edit)
         self.copy_button.hide()
         self.copy_button.clicked.connect(self.copy_code_block)
 
+        # Coalesce keystrokes so content is only serialized once typing pauses
+        self._content_changed_timer = QTimer(self)
+        self._content_changed_timer.setSingleShot(True)
+        self._content_changed_timer.setInterval(150)
+        self._content_changed_timer.timeout.connect(self._emit_content_changed)
+
+        # Streamed main content is inserted at most once per frame
+        self._pending_editor_chunks = []
+        self._editor_flush_timer = QTimer(self)
+        self._editor_flush_timer.setSingleShot(True)
+        self._editor_flush_timer.setInterval(16)
+        self._editor_flush_timer.timeout.connect(self._flush_pending_editor_chunks)
+        # One cursor is reused for every streamed insert instead of copying the editor's
+        self._append_cursor = QTextCursor(self.text_edit.document())
+        # AI stream parser state: a held-back partial tag and main text waiting for a boundary
+        self._ai_stream_buffer = ""
+        self._inside_think_tags = False
+        self._main_content_chunks = []
+        self._main_content_len = 0
+        self._avg_boundary_gap = 0.0
+
+        # Plain text of the editor and thinking widget, dropped whenever either changes
+        self._main_cache = None
+        self._thinking_cache = None
+        self.text_edit.thinking_text_changed.connect(self._invalidate_thinking_cache)
+
         self.text_edit.cursorPositionChanged.connect(self.update_copy_button_position)
         self.text_edit.textChanged.connect(self.on_text_changed)
 
     def on_text_changed(self):
-        """Handle text change for auto-save and emitting content changed signal."""
+        """Handle text change by scheduling a debounced content changed signal."""
+        self._main_cache = None
+        self._content_changed_timer.start()
+
+    def _invalidate_thinking_cache(self):
+        """Drop the cached thinking text after the thinking widget changes."""
+        self._thinking_cache = None
+
+    def _emit_content_changed(self):
+        """Emit content changed with the current content for auto-save."""
+        self._content_changed_timer.stop()
         self.content_changed.emit(self.get_content())
 
+    def hideEvent(self, event):
+        """Emit any pending content change before the editor goes away."""
+        if self._content_changed_timer.isActive():
+            self._emit_content_changed()
+        super().hideEvent(event)
+
     def set_content(self, content: str):
         """Set editor content including thinking content."""
         # Parse think tags from content
@@ -624,13 +804,26 @@ class MarkdownEditor(QWidget):
         else:
             self.text_edit.clear_thinking()
         
-        # Set main content
+        # Streamed text still queued for the previous content is dropped
+        self._pending_editor_chunks.clear()
+        self._editor_flush_timer.stop()
+        
+        # Set main content; this doesn't emit textChanged, so loading a note
+        # doesn't schedule a save of the same content
+        self._main_cache = None
         self.text_edit.set_raw_text(main_content)
 
     def get_content(self) -> str:
         """Get the editor content as plain text."""
-        main_content = self.text_edit.toPlainText()
-        thinking_content = self.text_edit.thinking_text.toPlainText() if hasattr(self.text_edit, 'thinking_text') else ""
+        # Make sure streamed content that hasn't been flushed yet is included
+        self.text_edit.flush_thinking_content()
+        self._flush_pending_editor_chunks()
+        if self._main_cache is None:
+            self._main_cache = self.text_edit.toPlainText()
+        if self._thinking_cache is None:
+            self._thinking_cache = self.text_edit.thinking_text.toPlainText() if self.text_edit.thinking_text is not None else ""
+        main_content = self._main_cache
+        thinking_content = self._thinking_cache
         
         # If there's thinking content, include it in the proper format
         if thinking_content.strip():
@@ -640,12 +833,11 @@ class MarkdownEditor(QWidget):
 
     def parse_think_tags(self, content: str) -> tuple[str, str]:
         """Parse think tags from content and return (main_content, thinking_content)."""
-        think_pattern = r'<think>(.*?)</think>'
-        think_match = re.search(think_pattern, content, re.DOTALL)
+        think_match = _THINK_BLOCK_RE.search(content)
         
         if think_match:
             thinking_content = think_match.group(1).strip()
-            main_content = re.sub(think_pattern, '', content, flags=re.DOTALL).strip()
+            main_content = _THINK_BLOCK_RE.sub('', content).strip()
             return main_content, thinking_content
         else:
             return content.strip(), ""
@@ -656,128 +848,135 @@ class MarkdownEditor(QWidget):
     
     def append_ai_stream_content(self, chunk: str):
         """Handle AI streaming content, separating thinking from regular content."""
-        if not hasattr(self, '_ai_stream_buffer'):
-            self._ai_stream_buffer = ""
-            self._inside_think_tags = False
-            self._main_content_buffer = ""
-            self._has_thinking_content = False
-            self._potential_tag_buffer = ""
-        
-        self._ai_stream_buffer += chunk
+        # The buffer only ever holds a partial tag left over from the previous chunk
+        buf = self._ai_stream_buffer + chunk
+        pos = 0
         
-        # Process the buffer to extract complete think blocks and regular content
+        # Scan the buffer once, left to right, jumping from tag to tag
         while True:
-            if not self._inside_think_tags:
-                # Look for potential opening think tag by detecting '<' character
-                lt_pos = self._ai_stream_buffer.find('<')
-                if lt_pos != -1:
-                    # Add any content before the '<' to main content buffer
-                    before_lt = self._ai_stream_buffer[:lt_pos]
-                    if before_lt.strip():
-                        self._main_content_buffer += before_lt
-                        self._flush_main_content_buffer()
-                    
-                    # Check if we have enough characters to determine if it's a think tag
-                    remaining = self._ai_stream_buffer[lt_pos:]
-                    if len(remaining) >= 7 and remaining.startswith('<think>'):
-                        # We found a complete think tag - show the thinking widget
-                        self._has_thinking_content = True
-                        # Position and show thinking widget
-                        self.text_edit.thinking_widget.setGeometry(10, 10, self.text_edit.width() - 20, self.text_edit.thinking_widget.height())
-                        self.text_edit.update_layout_spacing()  # This will handle visibility and margins
-                        
-                        # Remove processed content and enter think mode
-                        self._ai_stream_buffer = remaining[7:]  # +7 for '<think>'
-                        self._inside_think_tags = True
-                        continue
-                    elif len(remaining) < 7:
-                        # Not enough characters yet, keep the '<' and wait for more
-                        if before_lt:
-                            self._ai_stream_buffer = remaining
-                        break
-                    else:
-                        # It's not a think tag, treat '<' as regular content
-                        self._main_content_buffer += '<'
-                        self._ai_stream_buffer = remaining[1:]
-                        continue
-                else:
-                    # No '<' found, add to main content buffer
-                    if self._ai_stream_buffer:
-                        self._main_content_buffer += self._ai_stream_buffer
-                        self._ai_stream_buffer = ""
-                        # Only flush if we have complete words/sentences
-                        self._flush_main_content_buffer(force_partial=False)
-                    break
+            match = self._THINK_TAG_RE.search(buf, pos)
+            if match is None:
+                break
+            
+            tag = match.group()
+            if not self._inside_think_tags and tag == '<think>':
+                # Flush everything before the tag, then show the thinking widget
+                self._queue_main_content(buf[pos:match.start()])
+                self._flush_main_content_buffer()
+                self.text_edit.position_thinking_widget()
+                self.text_edit.update_layout_spacing()  # This will handle visibility and margins
+                self._inside_think_tags = True
+            elif self._inside_think_tags and tag == '</think>':
+                thinking_content = buf[pos:match.start()]
+                if thinking_content.strip():
+                    self.append_thinking_content(thinking_content)
+                self._inside_think_tags = False
             else:
-                # Look for closing think tag
-                think_end = self._ai_stream_buffer.find('</think>')
-                if think_end != -1:
-                    # Add thinking content (without the closing tag)
-                    thinking_content = self._ai_stream_buffer[:think_end]
-                    if thinking_content.strip():
-                        self.append_thinking_content(thinking_content)
-                    
-                    # Remove processed content and exit think mode (skip the closing tag)
-                    self._ai_stream_buffer = self._ai_stream_buffer[think_end + 8:]  # +8 for '</think>'
-                    self._inside_think_tags = False
-                    continue
-                else:
-                    # No closing tag yet, add current content to thinking
-                    if self._ai_stream_buffer.strip():
-                        self.append_thinking_content(self._ai_stream_buffer)
-                    self._ai_stream_buffer = ""
-                    break
+                # A tag that doesn't apply in the current state is plain text
+                self._emit_stream_text(buf[pos:match.end()])
+            pos = match.end()
+        
+        # Hold back a trailing '<...' that could still become a tag with the next chunk
+        # (tested in place on buf, without slicing off the tail)
+        tail = buf.rfind('<', pos)
+        tail_len = len(buf) - tail
+        if tail != -1 and tail_len < 8 and (buf.startswith('<think>'[:tail_len], tail) or
+                                            buf.startswith('</think>'[:tail_len], tail)):
+            self._emit_stream_text(buf[pos:tail])
+            self._ai_stream_buffer = buf[tail:]
+        else:
+            self._emit_stream_text(buf[pos:])
+            self._ai_stream_buffer = ""
+    
+    def _emit_stream_text(self, text: str):
+        """Route streamed text outside of tags to the thinking widget or main editor."""
+        if not text:
+            return
+        if self._inside_think_tags:
+            if text.strip():
+                self.append_thinking_content(text)
+        else:
+            self._queue_main_content(text)
+            # Only flush if we have complete words/sentences
+            self._flush_main_content_buffer(force_partial=False)
     
+    def _queue_main_content(self, text: str):
+        """Add streamed main content to the pending chunks without joining them."""
+        if text:
+            self._main_content_chunks.append(text)
+            self._main_content_len += len(text)
+
     def _flush_main_content_buffer(self, force_partial=True):
         """Flush the main content buffer, optionally waiting for complete words."""
-        if not self._main_content_buffer:
+        chunks = self._main_content_chunks
+        if not chunks:
             return
         
         content_to_add = ""
         
         if force_partial:
             # Add everything in the buffer
-            content_to_add = self._main_content_buffer
-            self._main_content_buffer = ""
+            content_to_add = "".join(chunks)
+            chunks.clear()
+            self._main_content_len = 0
         else:
-            # Only add complete words/sentences
-            import re
-            
-            # Find the last complete word or sentence
-            matches = list(re.finditer(r'[\s\n.!?;,]+', self._main_content_buffer))
-            
-            if matches:
-                # Get the position after the last word boundary
-                last_boundary = matches[-1].end()
-                content_to_add = self._main_content_buffer[:last_boundary]
-                self._main_content_buffer = self._main_content_buffer[last_boundary:]
-            elif len(self._main_content_buffer) > 100:  # If buffer gets too long, flush anyway
-                content_to_add = self._main_content_buffer
-                self._main_content_buffer = ""
+            # Only add complete words/sentences. Earlier chunks were left without
+            # boundaries by the previous flush, so only the newest one can hold one.
+            chunk = chunks[-1]
+            if chunk.translate(_WORD_BOUNDARY_DELETE) != chunk:
+                # The last boundary run ends right after the last boundary character
+                last_boundary = max(chunk.rfind(ch) for ch in _WORD_BOUNDARY_CHARS) + 1
+                chunks[-1] = chunk[:last_boundary]
+                content_to_add = "".join(chunks)
+                remainder = chunk[last_boundary:]
+                chunks[:] = [remainder] if remainder else []
+                self._main_content_len = len(remainder)
+                # Track how far apart boundaries typically are in this stream
+                self._avg_boundary_gap += 0.2 * (len(content_to_add) - self._avg_boundary_gap)
+            elif self._main_content_len > max(100, int(2 * self._avg_boundary_gap)):
+                # If buffer gets much longer than the usual gap between boundaries, flush anyway
+                content_to_add = "".join(chunks)
+                chunks.clear()
+                self._main_content_len = 0
         
         if content_to_add:
             self._append_to_main_editor(content_to_add)
     
     def _append_to_main_editor(self, content: str):
-        """Append content to the main editor."""
-        cursor = self.text_edit.textCursor()
+        """Queue content for the main editor; it is inserted on the next flush."""
+        self._pending_editor_chunks.append(content)
+        if not self._editor_flush_timer.isActive():
+            self._editor_flush_timer.start()
+
+    def _flush_pending_editor_chunks(self):
+        """Insert all queued main content in a single edit."""
+        self._editor_flush_timer.stop()
+        if not self._pending_editor_chunks:
+            return
+        cursor = self._append_cursor
         cursor.movePosition(QTextCursor.MoveOperation.End)
-        cursor.insertText(content)
+        cursor.insertText("".join(self._pending_editor_chunks))
+        self._pending_editor_chunks.clear()
         self.text_edit.setTextCursor(cursor)
     
     def clear_ai_stream_buffer(self):
         """Clear the AI stream buffer."""
-        if hasattr(self, '_ai_stream_buffer'):
-            # Flush any remaining content
-            if self._main_content_buffer:
-                self._flush_main_content_buffer()
-            
-            # Reset all buffers
-            self._ai_stream_buffer = ""
-            self._inside_think_tags = False
-            self._main_content_buffer = ""
-            self._has_thinking_content = False
-            self._potential_tag_buffer = ""
+        self.text_edit.flush_thinking_content()
+        # A held-back partial tag never completed, so it was plain text
+        if self._ai_stream_buffer and not self._inside_think_tags:
+            self._main_content_chunks.append(self._ai_stream_buffer)
+        
+        # Everything goes out at stream end; no boundary search needed
+        if self._main_content_chunks:
+            self._append_to_main_editor(''.join(self._main_content_chunks))
+        self._flush_pending_editor_chunks()
+        
+        # Reset all buffers
+        self._ai_stream_buffer = ""
+        self._inside_think_tags = False
+        self._main_content_chunks = []
+        self._main_content_len = 0
+        self._avg_boundary_gap = 0.0
     
     def connect_signals(self):
         """Connect toolbar signals."""
@@ -791,70 +990,70 @@ class MarkdownEditor(QWidget):
     def toggle_bold(self):
         """Toggle bold formatting."""
         cursor = self.text_edit.textCursor()
-        fmt = cursor.charFormat()
-        if fmt.fontWeight() == QFont.Weight.Bold:
+        # Merge only the changed property so other formatting runs are left alone
+        fmt = QTextCharFormat()
+        if cursor.charFormat().fontWeight() == QFont.Weight.Bold:
             fmt.setFontWeight(QFont.Weight.Normal)
         else:
             fmt.setFontWeight(QFont.Weight.Bold)
-        cursor.setCharFormat(fmt)
+        cursor.mergeCharFormat(fmt)
+        self._resync_format_buttons()
 
     def toggle_italic(self):
         """Toggle italic formatting."""
         cursor = self.text_edit.textCursor()
-        fmt = cursor.charFormat()
-        fmt.setFontItalic(not fmt.fontItalic())
-        cursor.setCharFormat(fmt)
+        fmt = QTextCharFormat()
+        fmt.setFontItalic(not cursor.charFormat().fontItalic())
+        cursor.mergeCharFormat(fmt)
+        self._resync_format_buttons()
 
     def toggle_code(self):
         """Toggle code formatting."""
         cursor = self.text_edit.textCursor()
-        fmt = cursor.charFormat()
-        if fmt.background() == Qt.GlobalColor.darkGray:
-            fmt.setBackground(Qt.GlobalColor.transparent)
-        else:
-            fmt.setBackground(Qt.GlobalColor.darkGray)
-        cursor.setCharFormat(fmt)
+        is_code = cursor.charFormat().boolProperty(_CODE_PROP)
+        fmt = QTextCharFormat()
+        fmt.setProperty(_CODE_PROP, not is_code)
+        fmt.setBackground(Qt.GlobalColor.transparent if is_code else Qt.GlobalColor.darkGray)
+        cursor.mergeCharFormat(fmt)
+        self._resync_format_buttons()
+
+    def _resync_format_buttons(self):
+        """Re-emit the current format so checkable buttons match the text again."""
+        # A click flips the button even when the format didn't change (no selection)
+        self.text_edit._last_fmt_sig = None
+        self.text_edit.on_cursor_position_changed()
 
     def update_copy_button_position(self):
         """Update copy button position based on cursor."""
         cursor = self.text_edit.textCursor()
-        block = cursor.block()
-        text = block.text()
         
-        # Check if cursor is in a code block
-        if text.strip().startswith('```') or '`' in text:
+        # Check if cursor is in a fenced code block (including its fences)
+        if self.text_edit.code_block_range(cursor.blockNumber()) is not None:
             rect = self.text_edit.cursorRect(cursor)
             self.copy_button.move(rect.right() + 5, rect.top())
+            # Stay above the thinking widget, which may be created after this button
+            self.copy_button.raise_()
             self.copy_button.show()
         else:
             self.copy_button.hide()
 
     def copy_code_block(self):
         """Copy the current code block to clipboard."""
-        cursor = self.text_edit.textCursor()
-        block = cursor.block()
-        
-        # Find the code block boundaries
-        start_block = block
-        end_block = block
-        
-        # Move to start of code block
-        while start_block.previous().isValid() and not start_block.text().strip().startswith('```'):
-            start_block = start_block.previous()
-        
-        # Move to end of code block
-        while end_block.next().isValid() and not end_block.text().strip().endswith('```'):
-            end_block = end_block.next()
-        
-        # Extract code content
-        code_lines = []
-        current_block = start_block.next()  # Skip opening ```
-        while current_block.isValid() and current_block != end_block:
-            code_lines.append(current_block.text())
-            current_block = current_block.next()
+        fence_range = self.text_edit.code_block_range(self.text_edit.textCursor().blockNumber())
+        if fence_range is None:
+            return
+        opening, closing = fence_range
+        if closing - opening < 2:
+            QApplication.clipboard().setText("")
+            return
         
-        code_content = '\n'.join(code_lines)
-        QApplication.clipboard().setText(code_content)
+        # Select the lines between the fences and copy them in one go
+        doc = self.text_edit.document()
+        last_block = doc.findBlockByNumber(closing - 1)
+        cursor = QTextCursor(doc)
+        cursor.setPosition(doc.findBlockByNumber(opening + 1).position())
+        cursor.setPosition(last_block.position() + last_block.length() - 1, QTextCursor.MoveMode.KeepAnchor)
+        QApplication.clipboard().setText(cursor.selection().toPlainText())
         
     def start_ai_animation(self):
         """Start AI button border animation."""
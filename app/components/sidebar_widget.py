@@ -1,17 +1,136 @@
 """Sidebar widget for notes editing."""
 
+import logging
 import os
+import re
 import json
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QFrame, QScrollArea, QSizePolicy, QTextEdit, QLineEdit
+from functools import lru_cache
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QFrame, QScrollArea, QSizePolicy, QTextEdit, QLineEdit, QStackedWidget
 # QSvgWidget removed - using QLabel with QPixmap instead to avoid deletion errors
-from PySide6.QtCore import Qt, Signal, QTimer, QSize, QEvent
-from PySide6.QtGui import QFont, QTextCharFormat, QTextCursor, QTextOption
+from PySide6.QtCore import Qt, QObject, Signal, QTimer, QSize, QEvent
+from PySide6.QtGui import QFont, QIcon, QPainter, QPixmap, QTextCharFormat, QTextCursor, QTextOption
+from PySide6.QtSvg import QSvgRenderer
 
 from .markdown_editor import MarkdownEditor, MarkdownTextEdit
 from app.services.database_manager import NotesDatabase
 from app.services.ai_client import OllamaClient
 from app.utils.translation_manager import tr
 
+logger = logging.getLogger(__name__)
+
+# Greedy prefix up to the last whitespace/punctuation, where streamed chat text can be flushed
+_LAST_WORD_BOUNDARY_RE = re.compile(r'.*[\s.!?;,]', re.DOTALL)
+
+_CONFIG_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "transcriber_config.json")
+# Parsed config and the mtime it was read at, so settings edits are still picked up
+_config_cache = {'mtime': None, 'data': None}
+
+
+def _load_config():
+    """Return transcriber_config.json, parsing it again only after the file changes."""
+    mtime = os.stat(_CONFIG_PATH).st_mtime_ns
+    if mtime != _config_cache['mtime']:
+        with open(_CONFIG_PATH, "r") as f:
+            _config_cache['data'] = json.load(f)
+        _config_cache['mtime'] = mtime
+    return _config_cache['data']
+
+
+# Colours in the bundled SVGs that are turned white for the dark theme
+_SVG_DARK_COLOR_RE = re.compile(r'currentColor|fill="black"|stroke="black"')
+_SVG_WHITE_SUBS = {
+    'currentColor': 'white',
+    'fill="black"': 'fill="white"',
+    'stroke="black"': 'stroke="white"',
+}
+
+
+def _whiten_svg(svg_content):
+    """Theme SVG text for the dark background in a single pass."""
+    return _SVG_DARK_COLOR_RE.sub(lambda m: _SVG_WHITE_SUBS[m.group(0)], svg_content)
+
+
+@lru_cache(maxsize=None)
+def _get_svg_bytes(icon_name):
+    """Read icons/<icon_name>.svg once and keep it themed and encoded for QSvgRenderer."""
+    with open(f'icons/{icon_name}.svg', 'r') as f:
+        return _whiten_svg(f.read()).encode('utf-8')
+
+
+@lru_cache(maxsize=None)
+def _get_svg_renderer(icon_name):
+    """Parse icons/<icon_name>.svg into one shared renderer; None if it isn't valid SVG."""
+    # No Qt parent: the renderer lives in the cache until the process exits
+    renderer = QSvgRenderer()
+    return renderer if renderer.load(_get_svg_bytes(icon_name)) else None
+
+
+@lru_cache(maxsize=None)
+def _get_icon_pixmap(icon_name, size):
+    """Render icons/<icon_name>.svg in white once per size; None if it can't be loaded."""
+    try:
+        renderer = _get_svg_renderer(icon_name)
+    except FileNotFoundError as e:
+        logger.warning("Error loading icon: %s", e)
+        return None
+    if renderer is None:
+        return None
+    
+    pixmap = QPixmap(size, size)
+    pixmap.fill(Qt.GlobalColor.transparent)
+    painter = QPainter(pixmap)
+    try:
+        renderer.render(painter)
+    finally:
+        painter.end()  # Ensure painter is always closed
+    return pixmap
+
+
+@lru_cache(maxsize=None)
+def _get_icon(icon_name, size):
+    """QIcon around the cached white pixmap; None if the SVG can't be loaded."""
+    pixmap = _get_icon_pixmap(icon_name, size)
+    return QIcon(pixmap) if pixmap is not None else None
+
+
+# Send/stop button; the two states only differ in colour
+_SEND_BUTTON_QSS_TEMPLATE = """
+    QPushButton {{
+        background-color: rgba({rgb}, 0.7);
+        border: none;
+        border-radius: 3px;
+        padding: 2px;
+    }}
+    QPushButton:hover {{
+        background-color: rgba({rgb}, 0.9);
+    }}
+"""
+_SEND_BUTTON_QSS = _SEND_BUTTON_QSS_TEMPLATE.format(rgb="100, 149, 237")
+_STOP_BUTTON_QSS = _SEND_BUTTON_QSS_TEMPLATE.format(rgb="255, 100, 100")
+
+
+# Chat bubbles, selected by each message's "bubble" property
+_CHAT_BUBBLES_QSS = """
+    QLabel[bubble="user"] {
+        background-color: rgba(70, 130, 180, 0.8);
+        border: 1px solid rgba(70, 130, 180, 0.9);
+        border-radius: 6px;
+        padding: 10px 12px;
+        color: white;
+        font-size: 14px;
+        line-height: 1.4;
+    }
+    QTextEdit[bubble="ai"] {
+        background-color: rgba(100, 149, 237, 0.1);
+        border: 1px solid rgba(100, 149, 237, 0.2);
+        border-radius: 6px;
+        padding: 10px 12px;
+        color: rgba(255, 255, 255, 0.9);
+        font-size: 14px;
+        line-height: 1.4;
+    }
+"""
+
 
 class ChatMessageWidget(QWidget):
     """Widget for displaying a single chat message."""
@@ -31,44 +150,14 @@ class ChatMessageWidget(QWidget):
         
         # Icon - use QLabel with QPixmap instead of QSvgWidget to avoid deletion issues
         icon_name = "user" if self.role == "user" else "ai"
-        icon_path = f'icons/{icon_name}.svg'
         self.icon = QLabel()
         self.icon.setFixedSize(20, 20)
         self.icon.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
-        try:
-            from PySide6.QtSvg import QSvgRenderer
-            from PySide6.QtGui import QPixmap, QPainter
-            
-            with open(icon_path, 'r') as f:
-                svg_content = f.read()
-            
-            # Replace currentColor with white for dark theme
-            themed_svg_content = svg_content.replace('currentColor', 'white')
-            # Also replace any black colors with white
-            themed_svg_content = themed_svg_content.replace('fill="black"', 'fill="white"')
-            themed_svg_content = themed_svg_content.replace('stroke="black"', 'stroke="white"')
-            
-            # Create QSvgRenderer and render to QPixmap with proper cleanup
-            renderer = QSvgRenderer(self)  # Set parent to ensure proper cleanup
-            if renderer.load(themed_svg_content.encode('utf-8')):
-                pixmap = QPixmap(20, 20)
-                pixmap.fill(Qt.GlobalColor.transparent)
-                
-                painter = QPainter(pixmap)
-                try:
-                    renderer.render(painter)
-                finally:
-                    painter.end()  # Ensure painter is always closed
-                
-                self.icon.setPixmap(pixmap)
-            else:
-                # Fallback if SVG loading fails
-                self.icon.setText("●" if self.role == "user" else "◆")
-                self.icon.setStyleSheet("color: white; font-size: 12px;")
-            
-        except (FileNotFoundError, ImportError) as e:
-            print(f"Error loading icon: {e}")
+        pixmap = _get_icon_pixmap(icon_name, 20)
+        if pixmap is not None:
+            self.icon.setPixmap(pixmap)
+        else:
             # Create a simple text fallback
             self.icon.setText("●" if self.role == "user" else "◆")
             self.icon.setStyleSheet("color: white; font-size: 12px;")
@@ -97,23 +186,59 @@ class ChatMessageWidget(QWidget):
         layout.addWidget(self.icon)
         layout.addLayout(content_layout)
 
+class _UiUpdateRelay(QObject):
+    """Carries UI updates from the AI worker thread to a sidebar.
+
+    It has no Qt parent, so it stays valid while the worker emits on it even if
+    the sidebar is deleted at the same time; Qt drops the queued connection then.
+    """
+    
+    update = Signal(str, object)  # (action, data)
+
+
 class SidebarWidget(QWidget):
     """Sidebar widget for editing notes related to sentences."""
     
     closed = Signal()  # Emitted when sidebar is closed
     
+    _THINK_TAG_RE = re.compile(r'<think>|</think>')
+    
     def __init__(self, sentence: str, timestamp: float = None, parent=None, all_sentences: list = [], study_mode: bool = False, fresh_conversation: bool = False):
         super().__init__(parent)
         self.sentence = sentence
         self.timestamp = timestamp
-        self.all_sentences = all_sentences
+        self.update_sentences(all_sentences)
         self.study_mode = study_mode
         self.fresh_conversation = fresh_conversation
         self.db = NotesDatabase()
         self.ollama_client = OllamaClient()
-        self.pending_updates = []
+        # Study-mode widgets, set once the study page is built
+        self.thinking_widget = None
+        self.thinking_text = None
+        self.chat_scroll_area = None
+        # Disable auto-scroll by default; user prefers no automatic scrolling
+        self.auto_scroll_enabled = False
+        # State for AI stream processing (reusing markdown editor's approach)
+        self.is_ai_responding = False
+        self._ai_stream_buffer = ""
+        self._inside_think_tags = False
+        self._main_content_buffer = ""
+        self._current_ai_message = None
         self.chat_history = []
+        # (role, content) messages not yet written to the database
+        self._unsaved_chat_messages = []
         self.current_ai_response = ""
+        # Streamed thinking chunks are batched and inserted at most once per frame
+        self._pending_thinking = []
+        self._thinking_flush_timer = QTimer(self)
+        self._thinking_flush_timer.setSingleShot(True)
+        self._thinking_flush_timer.setInterval(16)
+        self._thinking_flush_timer.timeout.connect(self.flush_thinking_content)
+        # The streamed answer is re-rendered as markdown at most ~30 times a second
+        self._chat_render_timer = QTimer(self)
+        self._chat_render_timer.setSingleShot(True)
+        self._chat_render_timer.setInterval(33)
+        self._chat_render_timer.timeout.connect(self.flush_chat_message)
         self.setup_ui()
         if not self.study_mode:
             self.load_existing_note()
@@ -122,11 +247,15 @@ class SidebarWidget(QWidget):
             if not self.fresh_conversation:
                 self.load_chat_history()
         
-        # Setup timer for thread-safe UI updates
-        self.update_timer = QTimer(self)  # Set parent for proper cleanup
-        self.update_timer.setSingleShot(False)
-        self.update_timer.timeout.connect(self.process_pending_updates)
-        self.update_timer.start(50)  # Check for updates every 50ms
+        # Queued, so updates emitted from the worker thread run on the main thread in order
+        self._ui_relay = _UiUpdateRelay()
+        self._ui_relay.update.connect(self.process_ui_update, Qt.ConnectionType.QueuedConnection)
+    
+    def update_sentences(self, sentences: list):
+        """Set the transcript sentences used as AI context."""
+        self.all_sentences = sentences
+        # Joined once here rather than on every prompt
+        self._sentences_joined = "\n".join(sentences)
     
     def setup_ui(self):
         """Setup sidebar UI."""
@@ -139,12 +268,9 @@ class SidebarWidget(QWidget):
             }
         """)
         
-        # Clear existing layout if it exists
-        if self.layout():
-            QWidget().setLayout(self.layout())
-        
-        # Reset UI components that will be recreated
-        self.send_icon = None
+        # Mode pages are built on first use by show_mode_page
+        self.editor = None
+        self.study_page = None
         self.send_button = None
         
         # Main layout
@@ -191,7 +317,6 @@ class SidebarWidget(QWidget):
         self.title_label = QLabel(self.sentence)
         self.title_label.setWordWrap(True)
         self.title_label.setMinimumWidth(0)  # Allow shrinking
-        from PySide6.QtWidgets import QSizePolicy
         self.title_label.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Minimum)
         self.title_label.setStyleSheet("""
             QLabel {
@@ -222,20 +347,38 @@ class SidebarWidget(QWidget):
         """)
         content_layout.addWidget(separator)
 
+        # One page per mode, so switching modes just flips the current page
+        self.mode_stack = QStackedWidget()
+        self.mode_stack.setMinimumWidth(0)  # Allow shrinking
+        self.mode_stack.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+        self.show_mode_page()
+        content_layout.addWidget(self.mode_stack, 1) # Make the page take all available space
+
+        main_layout.addLayout(content_layout)
+    
+    def show_mode_page(self):
+        """Show the page for the current mode, building it the first time."""
         if self.study_mode:
             # Study mode: Show thinking widget and chat interface
-            self.setup_study_mode_content(content_layout)
+            if self.study_page is None:
+                self.study_page = QWidget()
+                study_layout = QVBoxLayout(self.study_page)
+                study_layout.setContentsMargins(0, 0, 0, 0)
+                study_layout.setSpacing(20)
+                self.setup_study_mode_content(study_layout)
+                self.mode_stack.addWidget(self.study_page)
+            self.mode_stack.setCurrentWidget(self.study_page)
         else:
             # Normal mode: Show markdown editor
-            self.editor = MarkdownEditor()
-            self.editor.setMinimumWidth(0)  # Allow shrinking
-            self.editor.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
-            self.editor.content_changed.connect(self.save_note)
-            self.editor.ai_request.connect(self.get_ai_explanation)
-            self.editor.stop_request.connect(self.stop_ai_explanation)
-            content_layout.addWidget(self.editor, 1) # Make editor take all available space
-
-        main_layout.addLayout(content_layout)
+            if self.editor is None:
+                self.editor = MarkdownEditor()
+                self.editor.setMinimumWidth(0)  # Allow shrinking
+                self.editor.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+                self.editor.content_changed.connect(self.save_note)
+                self.editor.ai_request.connect(self.get_ai_explanation)
+                self.editor.stop_request.connect(self.stop_ai_explanation)
+                self.mode_stack.addWidget(self.editor)
+            self.mode_stack.setCurrentWidget(self.editor)
     
     def setup_study_mode_content(self, content_layout):
         """Setup study mode content with thinking widget and chat interface."""
@@ -287,24 +430,16 @@ class SidebarWidget(QWidget):
         self.thinking_text.setFont(font)
         
         thinking_layout.addWidget(self.thinking_text)
-
-        # Initialize state for AI stream processing (reusing markdown editor's approach)
-        self.is_ai_responding = False
-        self._ai_stream_buffer = ""
-        self._inside_think_tags = False
-        self._main_content_buffer = ""
-        self._has_thinking_content = False
         
         content_layout.addWidget(self.thinking_widget)
         
         # Chat display area - compact design
-        # Disable auto-scroll by default; user prefers no automatic scrolling
-        self.auto_scroll_enabled = False
         self.chat_scroll_area = QScrollArea()
         self.chat_scroll_area.setWidgetResizable(True)
         self.chat_scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
         # Allow manual vertical scrolling if content exceeds view, but we avoid auto-scroll programmatically
         self.chat_scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
+        self._chat_vbar = self.chat_scroll_area.verticalScrollBar()
         self.chat_scroll_area.setStyleSheet("""
             QScrollArea {
                 border: none;
@@ -323,6 +458,8 @@ class SidebarWidget(QWidget):
         """)
         
         self.chat_container = QWidget()
+        # One stylesheet for every message bubble instead of one per message
+        self.chat_container.setStyleSheet(_CHAT_BUBBLES_QSS)
         self.chat_layout = QVBoxLayout(self.chat_container)
         self.chat_layout.setContentsMargins(0, 0, 0, 0)
         self.chat_layout.setSpacing(2)
@@ -357,6 +494,7 @@ class SidebarWidget(QWidget):
         # Send/Stop button with icons
         self.send_button = QPushButton()
         self.send_button.setFixedSize(28, 24)
+        self.send_button.setIconSize(QSize(14, 14))
         self.send_button.clicked.connect(self.send_or_stop_message)
         self.update_send_button_icon(False)  # Start with send icon
         
@@ -367,87 +505,18 @@ class SidebarWidget(QWidget):
     def update_send_button_icon(self, is_stopping=False):
         """Update send button icon based on state."""
         # Check if send_button exists, if not, skip the update
-        if not hasattr(self, 'send_button') or self.send_button is None:
+        if self.send_button is None:
             return
             
-        icon_name = "pause" if is_stopping else "send"
-        icon_path = f'icons/{icon_name}.svg'
+        icon = _get_icon("pause" if is_stopping else "send", 14)
+        if icon is not None:
+            self.send_button.setIcon(icon)
+        else:
+            # Fallback if SVG loading fails
+            self.send_button.setText("⏸" if is_stopping else "▶")
         
-        try:
-            from PySide6.QtSvg import QSvgRenderer
-            from PySide6.QtGui import QPixmap, QPainter
-            
-            with open(icon_path, 'r') as f:
-                svg_content = f.read()
-            
-            # Replace currentColor with white for dark theme
-            themed_svg_content = svg_content.replace('currentColor', 'white')
-            # Also replace any black colors with white
-            themed_svg_content = themed_svg_content.replace('fill="black"', 'fill="white"')
-            themed_svg_content = themed_svg_content.replace('stroke="black"', 'stroke="white"')
-            
-            # Create QLabel for the icon instead of QSvgWidget
-            if not hasattr(self, 'send_icon') or self.send_icon is None:
-                self.send_icon = QLabel(self.send_button)
-                self.send_icon.setFixedSize(14, 14)
-                self.send_icon.setAlignment(Qt.AlignmentFlag.AlignCenter)
-                
-            # Create QSvgRenderer and render to QPixmap with proper cleanup
-            renderer = QSvgRenderer(self)  # Set parent to ensure proper cleanup
-            if renderer.load(themed_svg_content.encode('utf-8')):
-                pixmap = QPixmap(14, 14)
-                pixmap.fill(Qt.GlobalColor.transparent)
-                
-                painter = QPainter(pixmap)
-                try:
-                    renderer.render(painter)
-                finally:
-                    painter.end()  # Ensure painter is always closed
-                
-                self.send_icon.setPixmap(pixmap)
-            else:
-                # Fallback if SVG loading fails
-                self.send_icon.setText("⏸" if is_stopping else "▶")
-                self.send_icon.setStyleSheet("color: white; font-size: 10px;")
-            
-            # Set button style based on state
-            if is_stopping:
-                button_style = """
-                    QPushButton {
-                        background-color: rgba(255, 100, 100, 0.7);
-                        border: none;
-                        border-radius: 3px;
-                        padding: 2px;
-                    }
-                    QPushButton:hover {
-                        background-color: rgba(255, 100, 100, 0.9);
-                    }
-                """
-            else:
-                button_style = """
-                    QPushButton {
-                        background-color: rgba(100, 149, 237, 0.7);
-                        border: none;
-                        border-radius: 3px;
-                        padding: 2px;
-                    }
-                    QPushButton:hover {
-                        background-color: rgba(100, 149, 237, 0.9);
-                    }
-                """
-            
-            self.send_button.setStyleSheet(button_style)
-            
-            # Ensure icon is properly positioned without recreating layout
-            if not self.send_button.layout():
-                button_layout = QHBoxLayout(self.send_button)
-                button_layout.setContentsMargins(0, 0, 0, 0)
-                button_layout.addWidget(self.send_icon)
-            
-        except (FileNotFoundError, ImportError) as e:
-            print(f"Error loading icon: {e}")
-            # Fallback to text
-            self.send_button.setText("Stop" if is_stopping else "Send")
+        # Set button style based on state
+        self.send_button.setStyleSheet(_STOP_BUTTON_QSS if is_stopping else _SEND_BUTTON_QSS)
     
     def set_study_mode(self, enabled: bool):
         """Switch between study mode and normal mode."""
@@ -455,8 +524,7 @@ class SidebarWidget(QWidget):
             return
             
         self.study_mode = enabled
-        # Rebuild the UI
-        self.setup_ui()
+        self.show_mode_page()
         if not self.study_mode:
             self.load_existing_note()
     
@@ -486,49 +554,41 @@ class SidebarWidget(QWidget):
         """Add user message to chat history."""
         self.chat_history.append({"role": "user", "content": message})
         
-        # Save to database
-        try:
-            self.db.save_chat_message(self.sentence, "user", message)
-        except Exception as e:
-            print(f"Error saving user message to database: {e}")
+        # Save right away so the question survives if the answer never completes
+        self._unsaved_chat_messages.append(("user", message))
+        self.save_pending_chat_messages()
         
         # Create user message widget directly
         user_widget = self._create_user_message_widget(message)
         self.chat_layout.insertWidget(self.chat_layout.count() - 1, user_widget)
         
         # Auto-scroll to bottom (disabled by default)
-        if getattr(self, 'auto_scroll_enabled', False):
-            QTimer.singleShot(10, lambda: self.chat_scroll_area.verticalScrollBar().setValue(
-                self.chat_scroll_area.verticalScrollBar().maximum()
-            ))
+        self._maybe_scroll_to_bottom()
         
     def add_ai_message(self, message):
         """Add AI message to chat history."""
         self.chat_history.append({"role": "assistant", "content": message})
         
         # Save to database (only for non-streaming messages like errors)
-        try:
-            self.db.save_chat_message(self.sentence, "assistant", message)
-        except Exception as e:
-            print(f"Error saving AI message to database: {e}")
+        self._unsaved_chat_messages.append(("assistant", message))
+        self.save_pending_chat_messages()
         
         # Create AI message widget directly (this is for completed messages)
         ai_widget = self._create_ai_message_widget(message)
         self.chat_layout.insertWidget(self.chat_layout.count() - 1, ai_widget)
         
         # Auto-scroll to bottom (disabled by default)
-        if getattr(self, 'auto_scroll_enabled', False):
-            QTimer.singleShot(10, lambda: self.chat_scroll_area.verticalScrollBar().setValue(
-                self.chat_scroll_area.verticalScrollBar().maximum()
-            ))
+        self._maybe_scroll_to_bottom()
     
 
 
     def clear_thinking(self):
         """Clear thinking content and hide widget."""
-        if hasattr(self, 'thinking_text') and self.thinking_text is not None:
+        self._pending_thinking.clear()
+        self._thinking_flush_timer.stop()
+        if self.thinking_text is not None:
             self.thinking_text.clear()
-        if hasattr(self, 'thinking_widget') and self.thinking_widget is not None:
+        if self.thinking_widget is not None:
             self.thinking_widget.setVisible(False)
 
     def append_thinking_content(self, chunk):
@@ -537,10 +597,8 @@ class SidebarWidget(QWidget):
 
     def handle_user_message(self, message: str):
         """Handle user message and get AI response in study mode."""
-        config_path = os.path.join(os.path.dirname(__file__), "..", "..", "transcriber_config.json")
         try:
-            with open(config_path, "r") as f:
-                config = json.load(f)
+            config = _load_config()
             ollama_model = config.get("ollama_model", "")
             
             if not ollama_model:
@@ -555,7 +613,7 @@ class SidebarWidget(QWidget):
             self.clear_thinking()
                 
             # Create context that includes the conversation and chat history
-            context_parts = [chr(10).join(self.all_sentences)]
+            context_parts = [self._sentences_joined]
             
             # Add chat history if available
             if self.chat_history:
@@ -587,7 +645,7 @@ class SidebarWidget(QWidget):
         except Exception as e:
             self.add_ai_message(f"Error: {str(e)}")
             self.is_ai_responding = False
-            self.send_button.setText("Send")
+            self.update_send_button_icon(False)
     
     def process_ai_chunk(self, chunk):
         """Process AI response chunk in study mode - delegate to markdown editor to prevent duplication."""
@@ -598,21 +656,23 @@ class SidebarWidget(QWidget):
         # The markdown editor will handle all streaming logic
         pass
     
+    def save_pending_chat_messages(self):
+        """Write any unsaved chat messages to the database in one transaction."""
+        if not self._unsaved_chat_messages:
+            return
+        try:
+            self.db.save_chat_messages(self.sentence, self._unsaved_chat_messages)
+        except Exception:
+            logger.exception("Error saving chat messages to database")
+        self._unsaved_chat_messages = []
+    
     def cleanup(self):
         """Clean up resources before widget destruction."""
-        # Stop the update timer
-        if hasattr(self, 'update_timer') and self.update_timer:
-            self.update_timer.stop()
-            self.update_timer.deleteLater()
-            self.update_timer = None
+        # Write anything still queued (e.g. a reply added while closing)
+        self.save_pending_chat_messages()
         
         # Stop any ongoing AI requests
-        if hasattr(self, 'ollama_client') and self.ollama_client:
-            self.ollama_client.stop()
-        
-        # Clear pending updates
-        if hasattr(self, 'pending_updates'):
-            self.pending_updates.clear()
+        self.ollama_client.stop()
     
     def closeEvent(self, event):
         """Handle widget close event."""
@@ -623,15 +683,19 @@ class SidebarWidget(QWidget):
     
     def scroll_to_bottom(self):
         """Scroll chat to bottom."""
-        if hasattr(self, 'chat_scroll_area') and getattr(self, 'auto_scroll_enabled', False):
-            self.chat_scroll_area.verticalScrollBar().setValue(
-                self.chat_scroll_area.verticalScrollBar().maximum()
-            )
+        if self.chat_scroll_area is not None and self.auto_scroll_enabled:
+            self._chat_vbar.setValue(self._chat_vbar.maximum())
+    
+    def _maybe_scroll_to_bottom(self, delay=10):
+        """Scroll chat to bottom once layout settles; does nothing while auto-scroll is off."""
+        if not self.auto_scroll_enabled:
+            return
+        QTimer.singleShot(delay, self.scroll_to_bottom)
     
     def load_existing_note(self):
         """Load existing note from database."""
         note_data = self.db.get_note(self.sentence)
-        if hasattr(self, 'editor') and self.editor is not None:
+        if self.editor is not None:
             try:
                 if note_data:
                     _, _, content, _ = note_data
@@ -654,27 +718,38 @@ class SidebarWidget(QWidget):
             # Clear current chat history and UI
             self.chat_history.clear()
             
-            # Restore chat history and create widgets
-            for role, content in chat_messages:
-                # Add to chat history
-                self.chat_history.append({"role": role, "content": content})
-                
-                # Create and add widget to UI
-                if role == "user":
-                    widget = self._create_user_message_widget(content)
-                else:  # role == "assistant"
-                    widget = self._create_ai_message_widget(content)
+            # Add all widgets in one pass with painting off, then put the
+            # trailing stretch back so the layout settles once
+            create_user_widget = self._create_user_message_widget
+            create_ai_widget = self._create_ai_message_widget
+            chat_layout = self.chat_layout
+            self.chat_container.setUpdatesEnabled(False)
+            try:
+                chat_layout.takeAt(chat_layout.count() - 1)
                 
-                self.chat_layout.insertWidget(self.chat_layout.count() - 1, widget)
+                # Restore chat history and create widgets
+                for role, content in chat_messages:
+                    # Add to chat history
+                    self.chat_history.append({"role": role, "content": content})
+                    
+                    # Create and add widget to UI
+                    if role == "user":
+                        widget = create_user_widget(content)
+                    else:  # role == "assistant"
+                        widget = create_ai_widget(content)
+                    
+                    chat_layout.addWidget(widget)
+            finally:
+                chat_layout.addStretch()
+                self.chat_container.setUpdatesEnabled(True)
+            self.chat_container.updateGeometry()
             
             # Auto-scroll to bottom if there are messages (disabled by default)
-            if chat_messages and getattr(self, 'auto_scroll_enabled', False):
-                QTimer.singleShot(100, lambda: self.chat_scroll_area.verticalScrollBar().setValue(
-                    self.chat_scroll_area.verticalScrollBar().maximum()
-                ))
+            if chat_messages:
+                self._maybe_scroll_to_bottom(100)
                 
-        except Exception as e:
-            print(f"Error loading chat history: {e}")
+        except Exception:
+            logger.exception("Error loading chat history")
     
     def save_note(self, content: str):
         """Save note to database."""
@@ -686,9 +761,7 @@ class SidebarWidget(QWidget):
 
     def get_ai_explanation(self):
         """Get AI explanation for the sentence with thinking tags processing."""
-        config_path = os.path.join(os.path.dirname(__file__), "..", "..", "transcriber_config.json")
-        with open(config_path, "r") as f:
-            config = json.load(f)
+        config = _load_config()
         ollama_model = config.get("ollama_model", "")
 
         if not ollama_model:
@@ -696,7 +769,7 @@ class SidebarWidget(QWidget):
             return
 
         # Start AI button animation
-        if hasattr(self, 'editor') and self.editor is not None:
+        if self.editor is not None:
             try:
                 self.editor.start_ai_animation()
             except RuntimeError:
@@ -707,7 +780,6 @@ class SidebarWidget(QWidget):
 
         def on_chunk(chunk):
             # Only use the markdown editor's streaming mechanism
-            print(f"DEBUG: Sidebar received chunk: {chunk[:50]}...")
             self.queue_ui_update('process_chunk', chunk)
 
         def on_done():
@@ -715,7 +787,7 @@ class SidebarWidget(QWidget):
 
         self.ollama_client.get_explanation(
             model=ollama_model,
-            context="\n".join(self.all_sentences),
+            context=self._sentences_joined,
             sentence=self.sentence,  # The transcribed sentence to explain
             user_prompt=None,        # No user prompt in regular mode
             on_chunk=on_chunk,
@@ -725,131 +797,104 @@ class SidebarWidget(QWidget):
 
     def queue_ui_update(self, action, data=None):
         """Queue a UI update to be processed on the main thread."""
-        self.pending_updates.append((action, data))
-
-    def process_pending_updates(self):
-        """Process all pending UI updates on the main thread."""
-        if not self.pending_updates:
-            return
-            
-        for action, data in self.pending_updates:
-            if action == 'show_error':
-                if hasattr(self, 'editor') and self.editor is not None:
-                    try:
-                        self.editor.text_edit.insertPlainText(data)
-                    except RuntimeError:
-                        # Object has been deleted, ignore
-                        pass
-            elif action == 'show_ai_buttons':
-                if hasattr(self, 'editor') and self.editor is not None and hasattr(self.editor, 'toolbar'):
-                    try:
-                        self.editor.toolbar.ai_btn.setVisible(data)
-                        self.editor.toolbar.stop_btn.setVisible(not data)
-                    except RuntimeError:
-                        # Object has been deleted, ignore
-                        pass
-            elif action == 'process_chunk':
-                self.process_ai_chunk_safe(data)
-            elif action == 'finish_ai':
-                self.finish_ai_response()
+        # Emitted on the relay, never on the sidebar the main thread may be deleting
+        self._ui_relay.update.emit(action, data)
 
-                
-        self.pending_updates.clear()
+    def process_ui_update(self, action, data):
+        """Process one queued UI update on the main thread."""
+        if action == 'show_error':
+            if self.editor is not None:
+                try:
+                    self.editor.text_edit.insertPlainText(data)
+                except RuntimeError:
+                    # Object has been deleted, ignore
+                    pass
+        elif action == 'show_ai_buttons':
+            if self.editor is not None:
+                try:
+                    self.editor.toolbar.ai_btn.setVisible(data)
+                    self.editor.toolbar.stop_btn.setVisible(not data)
+                except RuntimeError:
+                    # Object has been deleted, ignore
+                    pass
+        elif action == 'process_chunk':
+            self.process_ai_chunk_safe(data)
+        elif action == 'finish_ai':
+            self.finish_ai_response()
 
     def process_ai_chunk_safe(self, chunk):
         """Process AI response chunk safely on the main thread."""
-        print(f"DEBUG: Processing chunk safely: {chunk[:50]}...")
+        # %.50s truncates only if debug logging is actually on
+        logger.debug("Processing chunk: %.50s", chunk)
         
         if self.study_mode:
             # Study mode: Handle AI streaming for chat interface
-            print("DEBUG: Study mode - processing chunk for chat")
             try:
                 self.process_ai_chunk_study_mode(chunk)
-            except Exception as e:
-                print(f"DEBUG: Error in study mode chunk processing: {e}")
+            except Exception:
+                logger.exception("Error in study mode chunk processing")
         else:
             # Normal mode: Use editor for AI streaming
-            if hasattr(self, 'editor') and self.editor is not None:
+            if self.editor is not None:
                 try:
-                    print("DEBUG: Calling editor.append_ai_stream_content")
                     self.editor.append_ai_stream_content(chunk)
                 except RuntimeError:
-                    print("DEBUG: RuntimeError in process_ai_chunk_safe")
                     # Object has been deleted, ignore the chunk
                     pass
             else:
-                print("DEBUG: Editor not available in process_ai_chunk_safe")
+                logger.debug("Editor not available for AI chunk")
 
     def process_ai_chunk_study_mode(self, chunk: str):
         """Process AI chunk for study mode chat interface."""
-        if not hasattr(self, '_ai_stream_buffer'):
-            self._ai_stream_buffer = ""
-            self._inside_think_tags = False
-            self._main_content_buffer = ""
-            self._has_thinking_content = False
-            self._current_ai_message = None
-        
-        self._ai_stream_buffer += chunk
+        # The buffer only ever holds a partial tag left over from the previous chunk
+        buf = self._ai_stream_buffer + chunk
+        pos = 0
         
-        # Process the buffer to extract complete think blocks and regular content
+        # Scan the buffer once, left to right, jumping from tag to tag
         while True:
-            if not self._inside_think_tags:
-                # Look for potential opening think tag by detecting '<' character
-                lt_pos = self._ai_stream_buffer.find('<')
-                if lt_pos != -1:
-                    # Add any content before the '<' to main content buffer
-                    before_lt = self._ai_stream_buffer[:lt_pos]
-                    if before_lt.strip():
-                        self._main_content_buffer += before_lt
-                        self._flush_main_content_buffer()
-                    
-                    # Check if we have enough characters to determine if it's a think tag
-                    remaining = self._ai_stream_buffer[lt_pos:]
-                    if len(remaining) >= 7 and remaining.startswith('<think>'):
-                        # We found a complete think tag - show thinking content
-                        self._has_thinking_content = True
-                        
-                        # Remove processed content and enter think mode
-                        self._ai_stream_buffer = remaining[7:]  # +7 for '<think>'
-                        self._inside_think_tags = True
-                        continue
-                    elif len(remaining) < 7:
-                        # Not enough characters yet, keep the '<' and wait for more
-                        if before_lt:
-                            self._ai_stream_buffer = remaining
-                        break
-                    else:
-                        # It's not a think tag, treat '<' as regular content
-                        self._main_content_buffer += '<'
-                        self._ai_stream_buffer = remaining[1:]
-                        continue
-                else:
-                    # No '<' found, add to main content buffer
-                    if self._ai_stream_buffer:
-                        self._main_content_buffer += self._ai_stream_buffer
-                        self._ai_stream_buffer = ""
-                        # Only flush if we have complete words/sentences
-                        self._flush_main_content_buffer(force_partial=False)
-                    break
+            match = self._THINK_TAG_RE.search(buf, pos)
+            if match is None:
+                break
+            
+            tag = match.group()
+            if not self._inside_think_tags and tag == '<think>':
+                # Flush everything before the tag, then switch to thinking content
+                self._main_content_buffer += buf[pos:match.start()]
+                if self._main_content_buffer.strip():
+                    self._flush_main_content_buffer()
+                self._inside_think_tags = True
+            elif self._inside_think_tags and tag == '</think>':
+                thinking_content = buf[pos:match.start()]
+                if thinking_content.strip():
+                    self._append_thinking_content(thinking_content)
+                self._inside_think_tags = False
             else:
-                # Look for closing think tag
-                think_end = self._ai_stream_buffer.find('</think>')
-                if think_end != -1:
-                    # Add thinking content (without the closing tag)
-                    thinking_content = self._ai_stream_buffer[:think_end]
-                    if thinking_content.strip():
-                        self._append_thinking_content(thinking_content)
-                    
-                    # Remove processed content and exit think mode (skip the closing tag)
-                    self._ai_stream_buffer = self._ai_stream_buffer[think_end + 8:]  # +8 for '</think>'
-                    self._inside_think_tags = False
-                    continue
-                else:
-                    # No closing tag yet, add current content to thinking
-                    if self._ai_stream_buffer.strip():
-                        self._append_thinking_content(self._ai_stream_buffer)
-                    self._ai_stream_buffer = ""
-                    break
+                # A tag that doesn't apply in the current state is plain text
+                self._emit_study_stream_text(buf[pos:match.end()])
+            pos = match.end()
+        
+        # Hold back a trailing '<...' that could still become a tag with the next chunk
+        tail = buf.rfind('<', pos)
+        tail_len = len(buf) - tail
+        if tail != -1 and tail_len < 8 and (buf.startswith('<think>'[:tail_len], tail) or
+                                            buf.startswith('</think>'[:tail_len], tail)):
+            self._emit_study_stream_text(buf[pos:tail])
+            self._ai_stream_buffer = buf[tail:]
+        else:
+            self._emit_study_stream_text(buf[pos:])
+            self._ai_stream_buffer = ""
+    
+    def _emit_study_stream_text(self, text: str):
+        """Route streamed text outside of tags to the thinking widget or the chat message."""
+        if not text:
+            return
+        if self._inside_think_tags:
+            if text.strip():
+                self._append_thinking_content(text)
+        else:
+            self._main_content_buffer += text
+            # Only flush if we have complete words/sentences
+            self._flush_main_content_buffer(force_partial=False)
     
     def _flush_main_content_buffer(self, force_partial=True):
         """Flush the main content buffer for study mode chat."""
@@ -864,14 +909,11 @@ class SidebarWidget(QWidget):
             self._main_content_buffer = ""
         else:
             # Only add complete words/sentences
-            import re
-            
-            # Find the last complete word or sentence
-            matches = list(re.finditer(r'[\s\n.!?;,]+', self._main_content_buffer))
+            match = _LAST_WORD_BOUNDARY_RE.match(self._main_content_buffer)
             
-            if matches:
+            if match:
                 # Get the position after the last word boundary
-                last_boundary = matches[-1].end()
+                last_boundary = match.end()
                 content_to_add = self._main_content_buffer[:last_boundary]
                 self._main_content_buffer = self._main_content_buffer[last_boundary:]
             elif len(self._main_content_buffer) > 100:  # If buffer gets too long, flush anyway
@@ -883,38 +925,50 @@ class SidebarWidget(QWidget):
     
     def _append_to_chat_message(self, content: str):
         """Append content to the current AI chat message."""
-        if not hasattr(self, '_current_ai_message') or self._current_ai_message is None:
+        if self._current_ai_message is None:
             # Create new AI message widget
             self._current_ai_message = self._create_ai_message_widget("")
             self.chat_layout.insertWidget(self.chat_layout.count() - 1, self._current_ai_message)
             # Initialize content buffer for streaming
             self._current_ai_message._content_buffer = ""
         
-        # Update the message content
-        if hasattr(self._current_ai_message, 'content_label'):
-            # Append to buffer
-            if not hasattr(self._current_ai_message, '_content_buffer'):
-                self._current_ai_message._content_buffer = ""
-            self._current_ai_message._content_buffer += content
-            
-            # Update the QTextEdit with markdown
-            if self._current_ai_message._content_buffer.strip():
-                self._current_ai_message.content_label.setMarkdown(self._current_ai_message._content_buffer)
-            else:
-                self._current_ai_message.content_label.setPlainText(self._current_ai_message._content_buffer)
-            
-            # Auto-resize the widget
-            self._resize_message_widget(self._current_ai_message.content_label)
-            
-            # Auto-scroll to bottom (disabled by default)
-            if getattr(self, 'auto_scroll_enabled', False):
-                QTimer.singleShot(10, lambda: self.chat_scroll_area.verticalScrollBar().setValue(
-                    self.chat_scroll_area.verticalScrollBar().maximum()
-                ))
+        # Update the message content; it is rendered on the next flush
+        self._current_ai_message._content_buffer += content
+        if not self._chat_render_timer.isActive():
+            self._chat_render_timer.start()
+    
+    def flush_chat_message(self):
+        """Render the current AI chat message from its accumulated markdown."""
+        self._chat_render_timer.stop()
+        if self._current_ai_message is None:
+            return
+        
+        # Update the QTextEdit with markdown
+        if self._current_ai_message._content_buffer.strip():
+            self._current_ai_message.content_label.setMarkdown(self._current_ai_message._content_buffer)
+        else:
+            self._current_ai_message.content_label.setPlainText(self._current_ai_message._content_buffer)
+        
+        # Auto-resize the widget
+        self._resize_message_widget(self._current_ai_message.content_label)
+        
+        # Auto-scroll to bottom (disabled by default)
+        self._maybe_scroll_to_bottom()
     
     def _append_thinking_content(self, content: str):
-        """Append thinking content to the thinking widget."""
-        if hasattr(self, 'thinking_text') and self.thinking_text is not None:
+        """Queue content for the thinking widget; it is inserted on the next flush."""
+        self._pending_thinking.append(content)
+        if not self._thinking_flush_timer.isActive():
+            self._thinking_flush_timer.start()
+    
+    def flush_thinking_content(self):
+        """Insert all queued thinking chunks in a single edit."""
+        self._thinking_flush_timer.stop()
+        if not self._pending_thinking:
+            return
+        content = "".join(self._pending_thinking)
+        self._pending_thinking.clear()
+        if self.thinking_text is not None:
             try:
                 # Show the thinking widget if it's hidden
                 if not self.thinking_widget.isVisible():
@@ -928,8 +982,8 @@ class SidebarWidget(QWidget):
                 # Auto-scroll to bottom
                 self.thinking_text.moveCursor(QTextCursor.MoveOperation.End)
                 
-            except Exception as e:
-                print(f"DEBUG: Error appending thinking content: {e}")
+            except Exception:
+                logger.exception("Error appending thinking content")
     
     def _create_user_message_widget(self, content: str):
         """Create a new user message widget for the chat."""
@@ -943,57 +997,21 @@ class SidebarWidget(QWidget):
         
         # Message content with user styling
         content_label = QLabel(content)
+        # Styled by _CHAT_BUBBLES_QSS on the chat container
+        content_label.setProperty("bubble", "user")
         content_label.setWordWrap(True)
-        content_label.setStyleSheet("""
-            QLabel {
-                background-color: rgba(70, 130, 180, 0.8);
-                border: 1px solid rgba(70, 130, 180, 0.9);
-                border-radius: 6px;
-                padding: 10px 12px;
-                color: white;
-                font-size: 14px;
-                line-height: 1.4;
-            }
-        """)
         
         # User avatar/icon using SVG
         avatar_label = QLabel()
         avatar_label.setFixedSize(20, 20)
         avatar_label.setAlignment(Qt.AlignmentFlag.AlignTop)
         
-        try:
-            from PySide6.QtSvg import QSvgRenderer
-            from PySide6.QtGui import QPixmap, QPainter
-            
-            icon_path = 'icons/user.svg'
-            with open(icon_path, 'r') as f:
-                svg_content = f.read()
-            
-            # Replace currentColor with white for dark theme
-            themed_svg_content = svg_content.replace('currentColor', 'white')
-            themed_svg_content = themed_svg_content.replace('fill="black"', 'fill="white"')
-            themed_svg_content = themed_svg_content.replace('stroke="black"', 'stroke="white"')
-            
-            # Create QSvgRenderer and render to QPixmap
-            renderer = QSvgRenderer(message_widget)
-            if renderer.load(themed_svg_content.encode('utf-8')):
-                pixmap = QPixmap(20, 20)
-                pixmap.fill(Qt.GlobalColor.transparent)
-                
-                painter = QPainter(pixmap)
-                try:
-                    renderer.render(painter)
-                finally:
-                    painter.end()
-                
-                avatar_label.setPixmap(pixmap)
-            else:
-                # Fallback if SVG loading fails
-                avatar_label.setText("U")
-                avatar_label.setStyleSheet("color: white; font-size: 8px; font-weight: bold;")
-                
-        except (FileNotFoundError, ImportError) as e:
-            print(f"Error loading user icon: {e}")
+        # The rendered avatar is cached and shared by every message
+        pixmap = _get_icon_pixmap('user', 20)
+        if pixmap is not None:
+            avatar_label.setPixmap(pixmap)
+        else:
+            # Fallback if SVG loading fails
             avatar_label.setText("U")
             avatar_label.setStyleSheet("color: white; font-size: 8px; font-weight: bold;")
         
@@ -1014,39 +1032,12 @@ class SidebarWidget(QWidget):
         avatar_label.setFixedSize(20, 20)
         avatar_label.setAlignment(Qt.AlignmentFlag.AlignTop)
         
-        try:
-            from PySide6.QtSvg import QSvgRenderer
-            from PySide6.QtGui import QPixmap, QPainter
-            
-            icon_path = 'icons/ai.svg'
-            with open(icon_path, 'r') as f:
-                svg_content = f.read()
-            
-            # Replace currentColor with white for dark theme
-            themed_svg_content = svg_content.replace('currentColor', 'white')
-            themed_svg_content = themed_svg_content.replace('fill="black"', 'fill="white"')
-            themed_svg_content = themed_svg_content.replace('stroke="black"', 'stroke="white"')
-            
-            # Create QSvgRenderer and render to QPixmap
-            renderer = QSvgRenderer(message_widget)
-            if renderer.load(themed_svg_content.encode('utf-8')):
-                pixmap = QPixmap(20, 20)
-                pixmap.fill(Qt.GlobalColor.transparent)
-                
-                painter = QPainter(pixmap)
-                try:
-                    renderer.render(painter)
-                finally:
-                    painter.end()
-                
-                avatar_label.setPixmap(pixmap)
-            else:
-                # Fallback if SVG loading fails
-                avatar_label.setText("AI")
-                avatar_label.setStyleSheet("color: white; font-size: 8px; font-weight: bold;")
-                
-        except (FileNotFoundError, ImportError) as e:
-            print(f"Error loading AI icon: {e}")
+        # The rendered avatar is cached and shared by every message
+        pixmap = _get_icon_pixmap('ai', 20)
+        if pixmap is not None:
+            avatar_label.setPixmap(pixmap)
+        else:
+            # Fallback if SVG loading fails
             avatar_label.setText("AI")
             avatar_label.setStyleSheet("color: white; font-size: 8px; font-weight: bold;")
         
@@ -1064,6 +1055,8 @@ class SidebarWidget(QWidget):
         content_text.setFrameShape(QFrame.Shape.NoFrame)
         # Recalculate height when the widget is resized (e.g., sidebar width changes)
         content_text.installEventFilter(self)
+        # (viewport width, document revision) of the last height calculation
+        content_text._last_resize_key = None
         
         # Set content with markdown support
         if content.strip():
@@ -1075,17 +1068,8 @@ class SidebarWidget(QWidget):
         content_text.document().contentsChanged.connect(
             lambda: self._resize_message_widget(content_text)
         )
-        content_text.setStyleSheet("""
-            QTextEdit {
-                background-color: rgba(100, 149, 237, 0.1);
-                border: 1px solid rgba(100, 149, 237, 0.2);
-                border-radius: 6px;
-                padding: 10px 12px;
-                color: rgba(255, 255, 255, 0.9);
-                font-size: 14px;
-                line-height: 1.4;
-            }
-        """)
+        # Styled by _CHAT_BUBBLES_QSS on the chat container
+        content_text.setProperty("bubble", "ai")
         
         # Set initial size
         self._resize_message_widget(content_text)
@@ -1120,6 +1104,10 @@ class SidebarWidget(QWidget):
 
             # Configure document for proper wrapping at the viewport width
             doc = text_edit.document()
+            # Skip the relayout if neither the width nor the text changed since the last pass
+            resize_key = (available_width, doc.revision())
+            if text_edit._last_resize_key == resize_key:
+                return
             # Remove extra document margins to keep math predictable
             try:
                 doc.setDocumentMargin(0)
@@ -1158,8 +1146,10 @@ class SidebarWidget(QWidget):
             text_edit.setFixedHeight(final_height)
 
             # Ensure internal scrollbar position is reset
-            if text_edit.verticalScrollBar() is not None:
-                text_edit.verticalScrollBar().setValue(0)
+            vbar = text_edit.verticalScrollBar()
+            if vbar is not None:
+                vbar.setValue(0)
+            text_edit._last_resize_key = resize_key
         except (RuntimeError, AttributeError):
             # Widget may be in the process of being deleted
             pass
@@ -1170,6 +1160,9 @@ class SidebarWidget(QWidget):
             if isinstance(obj, QTextEdit):
                 et = event.type()
                 if et in (QEvent.Type.Resize, QEvent.Type.FontChange, QEvent.Type.StyleChange, QEvent.Type.Polish):
+                    if et != QEvent.Type.Resize:
+                        # Font/style changes reflow the text without touching width or revision
+                        obj._last_resize_key = None
                     # Defer to end of event loop to ensure widths are final
                     QTimer.singleShot(0, lambda o=obj: self._resize_message_widget(o))
         except RuntimeError:
@@ -1181,45 +1174,40 @@ class SidebarWidget(QWidget):
         if self.study_mode:
             # Study mode cleanup
             try:
-                # Save the complete AI message to database
-                if hasattr(self, '_current_ai_message') and self._current_ai_message is not None:
-                    if hasattr(self._current_ai_message, 'content_label'):
-                        # Get content from buffer or QTextEdit
-                        if hasattr(self._current_ai_message, '_content_buffer'):
-                            complete_message = self._current_ai_message._content_buffer
-                        else:
-                            complete_message = self._current_ai_message.content_label.toPlainText()
-                        
-                        if complete_message.strip():  # Only save non-empty messages
-                            # Add to chat history
-                            self.chat_history.append({"role": "assistant", "content": complete_message})
-                            # Save to database
-                            try:
-                                self.db.save_chat_message(self.sentence, "assistant", complete_message)
-                            except Exception as e:
-                                print(f"Error saving AI message to database: {e}")
+                # The stream ended, so a held-back partial tag is just text
+                tail, self._ai_stream_buffer = self._ai_stream_buffer, ""
+                self._emit_study_stream_text(tail)
+                self._inside_think_tags = False
+                self.flush_thinking_content()
+
+                # Flush any remaining content so the saved message is complete
+                self._flush_main_content_buffer(force_partial=True)
+                self.flush_chat_message()
                 
-                # Flush any remaining content
-                if hasattr(self, '_flush_main_content_buffer'):
-                    self._flush_main_content_buffer(force_partial=True)
+                # Save the complete AI message to database
+                if self._current_ai_message is not None:
+                    complete_message = self._current_ai_message._content_buffer
+                    if complete_message.strip():  # Only save non-empty messages
+                        # Add to chat history
+                        self.chat_history.append({"role": "assistant", "content": complete_message})
+                        self._unsaved_chat_messages.append(("assistant", complete_message))
+                # Save the question and its answer together
+                self.save_pending_chat_messages()
                 
                 # Reset AI responding state
-                if hasattr(self, 'is_ai_responding'):
-                    self.is_ai_responding = False
+                self.is_ai_responding = False
                 
                 # Update send button icon
-                if hasattr(self, 'send_button'):
-                    self.update_send_button_icon(False)
+                self.update_send_button_icon(False)
                 
                 # Clear current message reference
-                if hasattr(self, '_current_ai_message'):
-                    self._current_ai_message = None
+                self._current_ai_message = None
                     
-            except Exception as e:
-                print(f"DEBUG: Error in study mode finish_ai_response: {e}")
+            except Exception:
+                logger.exception("Error in study mode finish_ai_response")
         else:
             # Normal mode cleanup
-            if hasattr(self, 'editor') and self.editor is not None:
+            if self.editor is not None:
                 try:
                     # Clear the AI stream buffer to process any remaining content
                     self.editor.clear_ai_stream_buffer()
@@ -1227,9 +1215,8 @@ class SidebarWidget(QWidget):
                     # Stop AI button animation
                     self.editor.stop_ai_animation()
                     
-                    if hasattr(self.editor, 'toolbar'):
-                        self.editor.toolbar.ai_btn.setVisible(True)
-                        self.editor.toolbar.stop_btn.setVisible(False)
+                    self.editor.toolbar.ai_btn.setVisible(True)
+                    self.editor.toolbar.stop_btn.setVisible(False)
                 except RuntimeError:
                     # Object has been deleted, ignore
                     pass
@@ -1239,21 +1226,19 @@ class SidebarWidget(QWidget):
         self.ollama_client.stop()
         
         # Reset AI responding state if in study mode
-        if self.study_mode and hasattr(self, 'is_ai_responding'):
+        if self.study_mode:
             self.is_ai_responding = False
-            if hasattr(self, 'send_button'):
-                self.update_send_button_icon(False)  # Switch back to send icon
+            self.update_send_button_icon(False)  # Switch back to send icon
             
             # Flush any remaining content
-            if hasattr(self, '_flush_main_content_buffer'):
-                self._flush_main_content_buffer(force_partial=True)
+            self._flush_main_content_buffer(force_partial=True)
+            self.flush_chat_message()
             
             # Clear current message reference
-            if hasattr(self, '_current_ai_message'):
-                self._current_ai_message = None
+            self._current_ai_message = None
         
         # Stop AI button animation
-        if hasattr(self, 'editor') and self.editor is not None:
+        if self.editor is not None:
             try:
                 self.editor.stop_ai_animation()
                 self.queue_ui_update('finish_ai')
@@ -1314,8 +1299,7 @@ class SidebarManager(QWidget):
         if sentence and sentence in self.active_sidebars:
             sidebar = self.active_sidebars.pop(sentence)
             # Clean up resources properly
-            if hasattr(sidebar, 'cleanup'):
-                sidebar.cleanup()
+            sidebar.cleanup()
             # Remove from layout first
             self.layout.removeWidget(sidebar)
             # Remove parent relationship
@@ -1213,7 +1213,7 @@ class AudioTranscriberGUI(QMainWindow):
             return
 
         self.project_dialog = ProjectDialog(projects, self)
-        self.project_dialog.project_deleted.connect(self.on_project_deleted_refresh)
+        self.project_dialog.project_deleted.connect(self.on_project_deleted)
         
         if self.project_dialog.exec():
             project_id = self.project_dialog.get_selected_project()
@@ -1233,21 +1233,6 @@ class AudioTranscriberGUI(QMainWindow):
                         self.translation_manager.translate("messages.project_load_error")
                     )
     
-    def on_project_deleted_refresh(self, project_id):
-        """Close and reopen the project dialog to refresh the list."""
-        # If the currently loaded project was deleted, clear the interface
-        if self.current_project_id == project_id:
-            self.clear_all()
-            self.current_project_id = None
-            self.current_transcription = None
-            self.sidebar_manager.close_all_sidebars()
-
-        # Close the current dialog
-        self.project_dialog.close()
-        
-        # Reopen the dialog after a short delay to ensure it's refreshed
-        QTimer.singleShot(100, self.open_project)
-
     def on_project_deleted(self, project_id):
         """Handle project deletion notification from dialog."""
         # If the currently loaded project was deleted, clear the interface
@@ -4,10 +4,13 @@ Handles communication with AI services like Ollama.
 """
 
 import json
+import logging
 import requests
 import threading
 from typing import Dict, Any, Callable
 
+logger = logging.getLogger(__name__)
+
 class OllamaClient:
     """Client for interacting with the Ollama API."""
 
@@ -131,10 +134,10 @@ Remember: You are {agent_name}, and your goal is to guide the student to underst
         """Stream the explanation from the Ollama API."""
         prompt = self._create_prompt(sentence, context, study_mode, user_prompt)
         
-        print(f"DEBUG: Starting AI request for model: {model}")
-        print(f"DEBUG: Sentence: {sentence}")
-        print(f"DEBUG: User prompt: {user_prompt}")
-        print(f"DEBUG: Study mode: {study_mode}")
+        logger.debug("Starting AI request for model: %s", model)
+        logger.debug("Sentence: %s", sentence)
+        logger.debug("User prompt: %s", user_prompt)
+        logger.debug("Study mode: %s", study_mode)
         
         try:
             payload = {
@@ -145,51 +148,51 @@ Remember: You are {agent_name}, and your goal is to guide the student to underst
             
             headers = {"Content-Type": "application/json"}
             
-            print(f"DEBUG: Making request to {self.api_url}")
+            logger.debug("Making request to %s", self.api_url)
             with requests.post(self.api_url, data=json.dumps(payload), headers=headers, stream=True) as response:
-                print(f"DEBUG: Response status: {response.status_code}")
+                logger.debug("Response status: %s", response.status_code)
                 response.raise_for_status()
                 chunk_count = 0
                 for line in response.iter_lines():
                     if self.stop_event.is_set():
-                        print("DEBUG: Stop event set, breaking")
+                        logger.debug("Stop event set, breaking")
                         break
                     if line:
                         data = json.loads(line)
                         chunk = data.get("response", "")
                         if chunk:
                             chunk_count += 1
-                            print(f"DEBUG: Received chunk {chunk_count}: {chunk[:50]}...")
+                            logger.debug("Received chunk %s: %.50s", chunk_count, chunk)
                             try:
                                 on_chunk(chunk)
                             except RuntimeError:
-                                print("DEBUG: RuntimeError in on_chunk, widget deleted")
+                                logger.debug("RuntimeError in on_chunk, widget deleted")
                                 # Widget was deleted, stop processing
                                 break
                         if data.get("done"):
-                            print("DEBUG: Received done signal")
+                            logger.debug("Received done signal")
                             break
-                print(f"DEBUG: Finished streaming, total chunks: {chunk_count}")
+                logger.debug("Finished streaming, total chunks: %s", chunk_count)
         except requests.exceptions.RequestException as e:
-            print(f"DEBUG: Request exception: {e}")
+            logger.debug("Request exception: %s", e)
             try:
                 on_chunk(f"\n\nError: {e}")
             except RuntimeError:
                 # Widget was deleted, ignore error
                 pass
         except Exception as e:
-            print(f"DEBUG: Unexpected exception: {e}")
+            logger.exception("Unexpected exception while streaming")
             try:
                 on_chunk(f"\n\nUnexpected error: {e}")
             except RuntimeError:
                 # Widget was deleted, ignore error
                 pass
         finally:
-            print("DEBUG: Calling on_done")
+            logger.debug("Calling on_done")
             try:
                 on_done()
             except RuntimeError:
-                print("DEBUG: RuntimeError in on_done, widget deleted")
+                logger.debug("RuntimeError in on_done, widget deleted")
                 # Widget was deleted, ignore error
                 pass
 
@@ -15,9 +15,15 @@ class NotesDatabase:
         self.db_path = db_path
         self.init_database()
     
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection to the notes database."""
+        return sqlite3.connect(self.db_path)
+    
     def init_database(self):
         """Create tables if they don't exist."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
+            # Persistent for the database file, so it only needs setting once
+            conn.execute("PRAGMA journal_mode=WAL")
             cursor = conn.cursor()
             # Create projects table
             cursor.execute("""
@@ -85,14 +91,14 @@ class NotesDatabase:
 
     def create_project(self, name: str, audio_filepath: str) -> int:
         """Create a new project and return its ID."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute("INSERT INTO projects (name, audio_filepath) VALUES (?, ?)", (name, audio_filepath))
             return cursor.lastrowid
 
     def get_all_projects(self) -> List[Tuple[int, str, str]]:
         """Get all projects. Returns list of (id, name, audio_filepath)."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT id, name, audio_filepath FROM projects ORDER BY updated_at DESC")
             projects = cursor.fetchall()
@@ -101,7 +107,7 @@ class NotesDatabase:
 
     def save_transcription_and_notes(self, project_id: int, transcription_result, notes: dict):
         """Save transcription sentences and notes for a project."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             # Clear existing data for this project
             cursor.execute("DELETE FROM notes WHERE sentence_id IN (SELECT id FROM sentences WHERE project_id = ?)", (project_id,))
@@ -137,7 +143,7 @@ class NotesDatabase:
 
     def load_project_data(self, project_id: int) -> Tuple[Optional[str], dict, dict]:
         """Load audio filepath, transcription, and notes for a project."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             # Get audio filepath and full transcription text
             cursor.execute("SELECT audio_filepath, transcription_text FROM projects WHERE id = ?", (project_id,))
@@ -166,7 +172,7 @@ class NotesDatabase:
     
     def save_note(self, sentence_text: str, content: str, timestamp: Optional[float] = None) -> int:
         """Save or update a note. Returns note ID."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             
             # First, find or create a sentence entry
@@ -205,7 +211,7 @@ class NotesDatabase:
     
     def get_note(self, sentence_text: str) -> Optional[Tuple[int, str, str, float]]:
         """Get note by sentence text. Returns (id, sentence_text, content, timestamp) or None."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 SELECT n.id, s.sentence_text, n.note_text, s.start_time 
@@ -217,7 +223,7 @@ class NotesDatabase:
     
     def get_all_notes(self) -> List[Tuple[int, str, str, float]]:
         """Get all notes. Returns list of (id, sentence_text, content, timestamp)."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 SELECT n.id, s.sentence_text, n.note_text, s.start_time 
@@ -229,7 +235,7 @@ class NotesDatabase:
     
     def delete_note(self, note_id: int) -> bool:
         """Delete a note by ID. Returns True if successful."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM notes WHERE id = ?", (note_id,))
             return cursor.rowcount > 0
@@ -237,7 +243,7 @@ class NotesDatabase:
     def delete_project(self, project_id: int) -> bool:
         """Delete a project and all associated data. Returns True if successful."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 
                 # First check if project exists
@@ -286,48 +292,48 @@ class NotesDatabase:
             print(f"Error deleting project {project_id}: {e}")
             return False
 
-    def save_chat_message(self, sentence_text: str, role: str, content: str) -> int:
-        """Save a chat message for a sentence. Returns message ID."""
-        with sqlite3.connect(self.db_path) as conn:
+    def _get_or_create_chat_sentence_id(self, cursor, sentence_text: str) -> int:
+        """Find the sentence entry chat messages hang off, creating it if needed."""
+        cursor.execute("SELECT id FROM sentences WHERE sentence_text = ?", (sentence_text,))
+        sentence_row = cursor.fetchone()
+        if sentence_row:
+            return sentence_row[0]
+        
+        # Create a new sentence entry
+        cursor.execute("""
+            INSERT INTO sentences (transcription_id, sentence_text, start_time, end_time, sentence_order) 
+            VALUES (1, ?, 0, 0, 0)
+        """, (sentence_text,))
+        return cursor.lastrowid
+
+    def save_chat_messages(self, sentence_text: str, messages: List[Tuple[str, str]]):
+        """Save several (role, content) chat messages for a sentence in one transaction."""
+        if not messages:
+            return
+        with self._connect() as conn:
             cursor = conn.cursor()
-            
-            # First, find or create a sentence entry
-            cursor.execute("SELECT id FROM sentences WHERE sentence_text = ?", (sentence_text,))
-            sentence_row = cursor.fetchone()
-            
-            if not sentence_row:
-                # Create a new sentence entry
-                cursor.execute("""
-                    INSERT INTO sentences (transcription_id, sentence_text, start_time, end_time, sentence_order) 
-                    VALUES (1, ?, 0, 0, 0)
-                """, (sentence_text,))
-                sentence_id = cursor.lastrowid
-            else:
-                sentence_id = sentence_row[0]
-            
-            # Save the chat message
-            cursor.execute("""
+            sentence_id = self._get_or_create_chat_sentence_id(cursor, sentence_text)
+            cursor.executemany("""
                 INSERT INTO chat_history (sentence_id, role, content) 
                 VALUES (?, ?, ?)
-            """, (sentence_id, role, content))
-            return cursor.lastrowid
+            """, [(sentence_id, role, content) for role, content in messages])
 
     def get_chat_history(self, sentence_text: str) -> List[Tuple[str, str]]:
         """Get chat history for a sentence. Returns list of (role, content) tuples."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 SELECT ch.role, ch.content
                 FROM chat_history ch
                 JOIN sentences s ON ch.sentence_id = s.id
                 WHERE s.sentence_text = ?
-                ORDER BY ch.created_at ASC
+                ORDER BY ch.created_at ASC, ch.id ASC
             """, (sentence_text,))
             return cursor.fetchall()
 
     def clear_chat_history(self, sentence_text: str) -> bool:
         """Clear chat history for a sentence. Returns True if successful."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 DELETE FROM chat_history 